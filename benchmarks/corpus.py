@@ -0,0 +1,67 @@
+import json
+import random
+from typing import Any, Iterator
+
+from codiac_sandbox.crud.create import get_puzzle_parameters
+from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES
+
+WORDS = (
+    "the of and to in is you that it he was for on are as with his they at be "
+    "this have from or one had by word but not what all were we when your can "
+    "said there use an each which she do how their if will up other about out "
+    "many then them these so some her would make like him into time has look "
+    "two more write go see number no way could people my than first water been"
+).split()
+
+TEXT_PARAMETERS = {"quote", "lyrics", "phrase", "question", "answer", "setup"}
+SOURCE_TYPES = ("Film", "TV", "Book", "Game")
+
+
+def sentence(rng: random.Random, low: int = 4, high: int = 24) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize() + "."
+
+
+def make_kwargs(puzzle_type: str, rng: random.Random) -> dict[str, Any]:
+    """Constructor arguments for `puzzle_type`, shaped like real submissions."""
+    kwargs: dict[str, Any] = {}
+    for name, param in get_puzzle_parameters(puzzle_type).items():
+        if name == "used":
+            continue
+        if param.annotation == list[str]:
+            kwargs[name] = sentence(rng).split()
+        elif name in TEXT_PARAMETERS:
+            kwargs[name] = sentence(rng)
+        elif name == "source_type":
+            kwargs[name] = rng.choice(SOURCE_TYPES)
+        elif name == "date":
+            kwargs[name] = str(rng.randint(1600, 2025))
+        else:
+            kwargs[name] = sentence(rng, 1, 3).rstrip(".").title()
+    return kwargs
+
+
+def make_record(puzzle_type: str, rng: random.Random) -> dict[str, Any]:
+    """A record in master-list format, built through the class's own constructor."""
+    puzzle = PUZZLE_CLASSES[puzzle_type](**make_kwargs(puzzle_type, rng))
+    record: dict[str, Any] = puzzle.to_json()
+    record.pop("length", None)
+    record["used"] = False
+    return record
+
+
+def iter_corpus(size: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+    """`size` records cycling through every entry of PUZZLE_CLASSES."""
+    rng = random.Random(seed)
+    puzzle_types = list(PUZZLE_CLASSES)
+    for i in range(size):
+        yield make_record(puzzle_types[i % len(puzzle_types)], rng)
+
+
+def write_corpus(path: str, size: int, seed: int = 0) -> None:
+    with open(path, "w") as f:
+        f.write("[\n")
+        for i, record in enumerate(iter_corpus(size, seed)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(record, indent=2))
+        f.write("\n]")
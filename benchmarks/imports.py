@@ -0,0 +1,73 @@
+from argparse import ArgumentParser
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> cumulative import budget in ms, as reported by -X importtime
+BUDGETS = {
+    "codiac_sandbox": 30,
+    "codiac_sandbox.crud.read": 100,
+    "codiac_sandbox.selection.schedule": 120,
+}
+
+# headless entry points must never pull these in
+FORBIDDEN = ("PySide6", "numpy", "pandas")
+
+PROBE = """
+import sys
+import {module}
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & {forbidden!r})
+print(",".join(heavy))
+"""
+
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """Cumulative import time in ms and the forbidden packages it loaded."""
+    # run from an empty directory, so any CWD-relative path fails loudly
+    with tempfile.TemporaryDirectory() as cwd:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                PROBE.format(module=module, forbidden=set(FORBIDDEN)),
+            ],
+            cwd=cwd,
+            env=os.environ | {"PYTHONPATH": REPO_DIR},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    microseconds = 0
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and line.split("|")[2].strip() == module:
+            microseconds = int(line.split("|")[1])
+    heavy = completed.stdout.strip()
+    return microseconds / 1000, heavy.split(",") if heavy else []
+
+
+def check(repeat: int) -> bool:
+    ok = True
+    for module, budget in BUDGETS.items():
+        # the best of several runs, since a cold disk cache dominates the first
+        timings = [measure_import(module) for _ in range(repeat)]
+        best = min(ms for ms, _ in timings)
+        heavy = sorted({name for _, names in timings for name in names})
+        status = "ok" if best <= budget and not heavy else "FAIL"
+        ok = ok and status == "ok"
+        print(f"{module:<40} {best:>7.1f} ms (budget {budget} ms) {status}")
+        if heavy:
+            print(f"    imports {', '.join(heavy)}")
+    return ok
+
+
+parser = ArgumentParser(description="Check import times of the headless entry points")
+parser.add_argument("--repeat", type=int, default=5, help="runs per module")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    sys.exit(0 if check(args.repeat) else 1)
@@ -0,0 +1,179 @@
+from argparse import ArgumentParser
+import asyncio
+from collections import Counter
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from codiac_sandbox.selection.calendar import get_calendar
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.statuses: Counter[int] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.bytes = 0
+
+
+async def client(
+    host: str,
+    port: int,
+    paths: list[str],
+    requests: int,
+    revalidate: float,
+    stats: Stats,
+    rng: random.Random,
+) -> None:
+    """One keep-alive connection sending `requests` GETs back to back."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as e:
+        stats.errors[type(e).__name__] += 1
+        return
+    etags: dict[str, str] = {}
+    try:
+        for _ in range(requests):
+            path = rng.choice(paths)
+            extra = ""
+            if path in etags and rng.random() < revalidate:
+                extra = f"If-None-Match: {etags[path]}\r\n"
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{extra}\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head.split(b" ", 2)[1])
+            length = 0
+            for line in head.decode("latin-1").split("\r\n")[1:]:
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+                elif name.lower() == "etag":
+                    etags[path] = value.strip()
+            body = await reader.readexactly(length)
+            stats.latencies.append(time.perf_counter() - start)
+            stats.statuses[status] += 1
+            stats.bytes += len(head) + len(body)
+    except (OSError, asyncio.IncompleteReadError) as e:
+        stats.errors[type(e).__name__] += 1
+    finally:
+        writer.close()
+
+
+async def run(
+    host: str, port: int, clients: int, requests: int, revalidate: float, seed: int
+) -> tuple[Stats, float]:
+    paths = ["/tutorial"] + [f"/puzzle/{key}" for key in sorted(get_calendar().dates)]
+    stats = Stats()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(
+                host,
+                port,
+                paths,
+                requests,
+                revalidate,
+                stats,
+                random.Random(rng.random()),
+            )
+            for _ in range(clients)
+        )
+    )
+    return stats, time.perf_counter() - start
+
+
+def percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def report(stats: Stats, seconds: float, clients: int) -> None:
+    latencies = sorted(stats.latencies)
+    total = len(latencies)
+    print(f"{clients:,} clients, {total:,} responses in {seconds:.2f}s")
+    print(f"{total / seconds:>12,.0f} requests/s")
+    print(f"{stats.bytes / seconds / 2**20:>12,.1f} MiB/s")
+    for q in (0.5, 0.95, 0.99):
+        print(f"  p{int(q * 100):<3} {percentile(latencies, q) * 1000:>9.2f} ms")
+    print(f"  max  {(latencies[-1] if latencies else 0) * 1000:>9.2f} ms")
+    for status, count in sorted(stats.statuses.items()):
+        print(f"  HTTP {status}: {count:,}")
+    for name, count in stats.errors.most_common():
+        print(f"  {name}: {count:,}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(port: int, cache_size: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "serve.py",
+            "--port",
+            str(port),
+            "--cache-size",
+            str(cache_size),
+        ],
+        cwd=REPO_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("the server did not start listening")
+
+
+parser = ArgumentParser(
+    description="Hammer the puzzle server with many concurrent keep-alive clients"
+)
+parser.add_argument(
+    "--url",
+    default=None,
+    help="a running server, e.g. http://127.0.0.1:8000 (default: start one for the run)",
+)
+parser.add_argument("--clients", type=int, default=2000, help="concurrent connections")
+parser.add_argument("--requests", type=int, default=20, help="requests per client")
+parser.add_argument(
+    "--revalidate",
+    type=float,
+    default=0.5,
+    help="share of repeat requests sent with If-None-Match",
+)
+parser.add_argument(
+    "--cache-size", type=int, default=1024, help="for the server this script starts"
+)
+parser.add_argument("--seed", type=int, default=0)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    server = None
+    if args.url is None:
+        host, port = "127.0.0.1", free_port()
+        server = spawn_server(port, args.cache_size)
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname or "127.0.0.1", url.port or 80
+    try:
+        stats, seconds = asyncio.run(
+            run(host, port, args.clients, args.requests, args.revalidate, args.seed)
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    report(stats, seconds, args.clients)
@@ -0,0 +1,235 @@
+from argparse import ArgumentParser
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from benchmarks.corpus import iter_corpus, make_kwargs, write_corpus
+from codiac_sandbox.crud import store as store_module
+from codiac_sandbox.crud.create import save_puzzle
+from codiac_sandbox.crud.read import iter_json_array
+from codiac_sandbox.crud.store import PuzzleStore
+from codiac_sandbox.utils.make_letter_map import get_new_letter_map
+from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES, parse_puzzle
+
+RESULTS_DIR = "benchmarks/results"
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# number of inserts timed against a store of the given size
+SAVE_SAMPLE = 1_000
+
+# op name -> builds (setup(size, workdir) -> run() -> items processed)
+Benchmark = Callable[[int, str], Callable[[], int]]
+
+
+def bench_parse_puzzle(size: int, workdir: str) -> Callable[[], int]:
+    records = list(iter_corpus(size))
+    return lambda: len(list(map(parse_puzzle, records)))
+
+
+def bench_to_json(size: int, workdir: str) -> Callable[[], int]:
+    puzzles = [parse_puzzle(record) for record in iter_corpus(size)]
+    return lambda: sum(1 for puzzle in puzzles if puzzle.to_json())
+
+
+def bench_to_json_frontend(size: int, workdir: str) -> Callable[[], int]:
+    records = list(iter_corpus(size))
+
+    def run() -> int:
+        # fresh objects each time so the lazy map and hints are really built
+        for record in records:
+            parse_puzzle(record).to_json(to_read_from_frontend=True)
+        return len(records)
+
+    return run
+
+
+def bench_hold_puzzles(size: int, workdir: str) -> Callable[[], int]:
+    records = list(iter_corpus(size))
+
+    def run() -> int:
+        # peak memory is what an archive costs to keep, maps and hints included
+        puzzles = [parse_puzzle(record) for record in records]
+        for puzzle in puzzles:
+            puzzle.encryption_map, puzzle.hints
+        return len(puzzles)
+
+    return run
+
+
+def bench_get_new_letter_map(size: int, workdir: str) -> Callable[[], int]:
+    quotes = [record["string_to_encrypt"] for record in iter_corpus(size)]
+    return lambda: sum(1 for quote in quotes if get_new_letter_map(quote) is not None)
+
+
+def _corpus_store(size: int, workdir: str) -> PuzzleStore:
+    source = os.path.join(workdir, f"corpus-{size}.json")
+    if not os.path.exists(source):
+        write_corpus(source, size)
+    return PuzzleStore(os.path.join(workdir, f"store-{size}"), source)
+
+
+def bench_load_quotes(size: int, workdir: str) -> Callable[[], int]:
+    from codiac_sandbox.gui.puzzle_loader import PuzzleLoader
+
+    store_module._store = _corpus_store(size, workdir)
+
+    def run() -> int:
+        # run the loader inline; its signals then call straight back
+        loader = PuzzleLoader()
+        loaded: list[int] = []
+        loader.signals.chunk.connect(
+            lambda groups: loaded.append(sum(map(len, groups.values())))
+        )
+        loader.run()
+        return sum(loaded)
+
+    return run
+
+
+def bench_save_puzzle(size: int, workdir: str) -> Callable[[], int]:
+    store_module._store = _corpus_store(size, workdir)
+    rng = random.Random(1)
+    puzzle_types = [
+        list(PUZZLE_CLASSES)[i % len(PUZZLE_CLASSES)] for i in range(SAVE_SAMPLE)
+    ]
+    submissions = [
+        (PUZZLE_CLASSES[puzzle_type], make_kwargs(puzzle_type, rng))
+        for puzzle_type in puzzle_types
+    ]
+
+    def run() -> int:
+        for cls, kwargs in submissions:
+            save_puzzle(cls, kwargs)
+        return len(submissions)
+
+    return run
+
+
+def bench_stream_master_list(size: int, workdir: str) -> Callable[[], int]:
+    source = os.path.join(workdir, f"corpus-{size}.json")
+    if not os.path.exists(source):
+        write_corpus(source, size)
+    return lambda: sum(1 for _ in iter_json_array(source))
+
+
+BENCHMARKS: dict[str, Benchmark] = {
+    "parse_puzzle": bench_parse_puzzle,
+    "to_json": bench_to_json,
+    "to_json_frontend": bench_to_json_frontend,
+    "hold_puzzles": bench_hold_puzzles,
+    "get_new_letter_map": bench_get_new_letter_map,
+    "stream_master_list": bench_stream_master_list,
+    "load_quotes": bench_load_quotes,
+    "save_puzzle": bench_save_puzzle,
+}
+
+QT_BENCHMARKS = {"load_quotes"}
+
+
+def measure(benchmark: Benchmark, size: int, workdir: str) -> dict[str, Any]:
+    run = benchmark(size, workdir)
+    gc.collect()
+    start = time.perf_counter()
+    items = run()
+    seconds = time.perf_counter() - start
+
+    # a second pass under tracemalloc, which would skew the timing above
+    run = benchmark(size, workdir)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(
+        size=size,
+        items=items,
+        seconds=seconds,
+        throughput=items / seconds if seconds else None,
+        peak_bytes=peak,
+    )
+
+
+def run_suite(names: list[str], sizes: list[int]) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            if name in QT_BENCHMARKS:
+                try:
+                    import PySide6  # noqa: F401
+                except ImportError:
+                    print(f"skipping {name}: PySide6 is not installed", file=sys.stderr)
+                    continue
+            for size in sizes:
+                result = dict(op=name) | measure(BENCHMARKS[name], size, workdir)
+                results.append(result)
+                print(
+                    f"{name:<20} {size:>9,} {result['seconds']:>9.3f}s "
+                    f"{result['throughput'] or 0:>12,.0f}/s "
+                    f"{result['peak_bytes'] / 2**20:>9.1f} MiB"
+                )
+    return dict(
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        results=results,
+    )
+
+
+def compare(current: dict[str, Any], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {(r["op"], r["size"]): r for r in json.load(f)["results"]}
+    print(f"\ncompared with {baseline_path}:")
+    for result in current["results"]:
+        if (old := baseline.get((result["op"], result["size"]))) is None:
+            continue
+        print(
+            f"{result['op']:<20} {result['size']:>9,} "
+            f"time x{result['seconds'] / old['seconds']:.2f} "
+            f"memory x{result['peak_bytes'] / max(old['peak_bytes'], 1):.2f}"
+        )
+
+
+parser = ArgumentParser(
+    description="Benchmark the parse / serialize / generate hot paths"
+)
+parser.add_argument(
+    "--sizes",
+    type=lambda s: [int(size) for size in s.split(",")],
+    default=list(DEFAULT_SIZES),
+    help="comma separated corpus sizes, e.g. 1000,10000,1000000",
+)
+parser.add_argument(
+    "--ops",
+    type=lambda s: s.split(","),
+    default=list(BENCHMARKS),
+    help="comma separated",
+)
+parser.add_argument("--output", default=None, help="where to write the JSON results")
+parser.add_argument(
+    "--compare", default=None, help="earlier results JSON to compare against"
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    # the Qt-backed paths never open a window, but Qt still wants a platform
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    report = run_suite(args.ops, args.sizes)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {output}")
+    if args.compare:
+        compare(report, args.compare)
@@ -0,0 +1,32 @@
+import importlib
+from typing import Any
+
+# public names, imported from their module on first access so that
+# `import codiac_sandbox` stays cheap for headless scripts
+_EXPORTS = {
+    "CryptographBase": "codiac_sandbox.puzzle_types",
+    "PUZZLE_CLASSES": "codiac_sandbox.utils.puzzle_classes",
+    "parse_puzzle": "codiac_sandbox.utils.puzzle_classes",
+    "PuzzleStore": "codiac_sandbox.crud.store",
+    "get_store": "codiac_sandbox.crud.store",
+    "get_puzzle": "codiac_sandbox.crud.read",
+    "iter_records": "codiac_sandbox.crud.read",
+    "save_puzzle": "codiac_sandbox.crud.create",
+    "schedule_range": "codiac_sandbox.selection.schedule",
+    "serialize_frontend": "codiac_sandbox.utils.serializer",
+    "resource_path": "codiac_sandbox.resources",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,134 @@
+import csv
+import json
+import re
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from codiac_sandbox.crud.duplicates import index_duplicate
+from codiac_sandbox.crud.search import get_search_index
+from codiac_sandbox.crud.store import get_store, puzzle_id
+from codiac_sandbox.crud.update import compact
+from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES, SCHEMAS, Field
+from codiac_sandbox.utils.tracing import span, traced
+
+TYPE_COLUMNS = ("type", "puzzle_type")
+PUNCTUATION = str.maketrans(
+    {"‘": "'", "’": "'", "“": '"', "”": '"', "–": "-", "—": "-"}
+)
+
+# where a row came from, e.g. "submissions.csv:12", and its raw columns
+Row = tuple[str, dict[str, Any]]
+
+
+class Rejected(NamedTuple):
+    source: str
+    reason: str
+    row: dict[str, Any]
+
+
+def column_name(header: str) -> str:
+    """Form headers like "Character Name" become parameter names like character_name."""
+    return re.sub(r"[^a-z0-9]+", "_", header.strip().lower()).strip("_")
+
+
+def read_rows(path: str) -> Iterator[Row]:
+    """Rows of a CSV export with a header line, or of a JSON-lines file."""
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path) as f:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    yield f"{path}:{number}", json.loads(line)
+    else:
+        # form exports often start with a byte order mark
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for number, row in enumerate(csv.DictReader(f), 2):
+                yield f"{path}:{number}", dict(row)
+
+
+def _class_names() -> dict[str, str]:
+    return {column_name(name).replace("_", ""): name for name in PUZZLE_CLASSES}
+
+
+def normalize_value(value: Any, field: Field) -> Any:
+    # JSON-lines rows may already hold booleans and lists
+    if isinstance(value, (bool, list)):
+        return value
+    return field.from_text(" ".join(str(value).translate(PUNCTUATION).split()))
+
+
+def normalize_row(row: Row) -> dict[str, Any] | Rejected:
+    """The stored record for one submission, or why it cannot be imported."""
+    source, raw = row
+    columns = {column_name(k): v for k, v in raw.items() if k is not None}
+    type_value = next((columns[c] for c in TYPE_COLUMNS if columns.get(c)), None)
+    if type_value is None:
+        return Rejected(source, "no puzzle type", raw)
+    puzzle_type = _class_names().get(column_name(str(type_value)).replace("_", ""))
+    if puzzle_type is None:
+        return Rejected(source, f"unknown puzzle type {type_value!r}", raw)
+
+    # every constructor argument, including the optional ones the dialog hides
+    schema = SCHEMAS[puzzle_type]
+    kwargs = {
+        name: normalize_value(columns[name], field)
+        for name, field in schema.fields.items()
+        if columns.get(name) not in (None, "", [])
+    }
+    if missing := schema.missing(kwargs):
+        return Rejected(source, f"missing {', '.join(missing)}", raw)
+
+    try:
+        record = schema.cls(**kwargs).to_json()
+    except (TypeError, ValueError) as error:
+        return Rejected(source, str(error), raw)
+    if not re.search(r"[a-z]", str(record["string_to_encrypt"]).lower()):
+        return Rejected(source, "nothing to encrypt", raw)
+    return record
+
+
+def normalize_rows(
+    rows: list[Row], workers: int | None = None
+) -> list[dict[str, Any] | Rejected]:
+    if workers == 1 or len(rows) <= 1:
+        return list(map(normalize_row, rows))
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(normalize_row, rows, chunksize=max(1, len(rows) // 64)))
+
+
+@traced()
+def import_rows(
+    rows: Iterable[Row], workers: int | None = None, dry_run: bool = False
+) -> tuple[list[str], list[Rejected]]:
+    """
+    Validate every row, then store the good ones with a single log append
+    and one rewrite of the master list. Rows whose puzzle is already stored,
+    or appears earlier in the batch, are rejected as duplicates so exports
+    can be re-imported. Returns the new puzzle IDs and the rejected rows.
+    """
+    rows = list(rows)
+    store = get_store()
+    records: list[dict[str, Any]] = []
+    rejected: list[Rejected] = []
+    seen: set[str] = set()
+    for (source, raw), result in zip(rows, normalize_rows(rows, workers)):
+        if isinstance(result, Rejected):
+            rejected.append(result)
+            continue
+        key = puzzle_id(result)
+        if key in store or key in seen:
+            rejected.append(Rejected(source, f"duplicate of {key}", raw))
+            continue
+        seen.add(key)
+        records.append(result)
+
+    if dry_run or not records:
+        return [], rejected
+    with span("store.append"):
+        ids = store.add_many(records)
+    # one replay of the appended batch rather than a log scan per record
+    get_search_index()
+    for new_id, record in zip(ids, records):
+        index_duplicate(new_id, str(record["string_to_encrypt"]))
+    compact()
+    return ids, rejected
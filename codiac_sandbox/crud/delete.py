@@ -1 +1,5 @@
-# TODO some other time a long ways from now
+from codiac_sandbox.crud.store import get_store
+
+
+def delete_puzzle(puzzle_id: str) -> None:
+    get_store().delete(puzzle_id)
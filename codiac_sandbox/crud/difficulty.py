@@ -0,0 +1,176 @@
+import hashlib
+import os
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore[import-untyped]
+
+from codiac_sandbox.crud.store import STORE_DIR
+from codiac_sandbox.utils.solver import word_pattern
+from codiac_sandbox.utils.tracing import traced
+
+# bump whenever compute_features changes, to drop cached rows
+FEATURES_VERSION = 1
+FEATURES_PATH = os.path.join(STORE_DIR, f"difficulty-features-v{FEATURES_VERSION}.csv")
+
+FEATURES = (
+    "log_letters",
+    "distinct_letters",
+    "entropy",
+    "mean_word_length",
+    "short_word_share",
+    "repeated_letter_share",
+    "repeated_pattern_share",
+    "punctuation_density",
+)
+
+# score = intercept + weights . features, clipped to 0-10. More text, short
+# words, repeated word shapes and punctuation all give a solver footholds;
+# many distinct letters spread evenly make frequency analysis harder.
+INTERCEPT = 4.0
+DIFFICULTY_WEIGHTS = {
+    "log_letters": -1.0,
+    "distinct_letters": 0.15,
+    "entropy": 1.0,
+    "mean_word_length": 0.4,
+    "short_word_share": -3.0,
+    "repeated_letter_share": -1.0,
+    "repeated_pattern_share": -2.0,
+    "punctuation_density": -10.0,
+}
+
+
+def letter_counts(quotes: Sequence[str]) -> np.ndarray:
+    """(n, 26) matrix of a-z occurrence counts per quote."""
+    encoded = [quote.lower().encode() for quote in quotes]
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    rows = np.repeat(
+        np.arange(len(encoded)), np.fromiter(map(len, encoded), dtype=np.int64)
+    )
+    letters = (data >= ord("a")) & (data <= ord("z"))
+    flat = rows[letters] * 26 + (data[letters] - ord("a"))
+    return np.bincount(flat, minlength=len(encoded) * 26).reshape(-1, 26)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.lower().encode(), digest_size=8).hexdigest()
+
+
+@traced()
+def compute_features(texts: Sequence[str]) -> pd.DataFrame:
+    """One row of FEATURES per text, computed for the whole batch at once."""
+    counts = letter_counts(texts)
+    letters = counts.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = counts / letters[:, None]
+        entropy = -np.nansum(np.where(p > 0, p * np.log2(p), 0.0), axis=1)
+
+    lowered = pd.Series(texts, dtype=str).str.lower()
+    words = lowered.str.findall(r"[a-z]+").explode().dropna()
+    lengths = words.str.len()
+    # patterns only depend on the word, and the vocabulary is much smaller
+    unique = pd.unique(words)
+    patterns = words.map({word: word_pattern(word) for word in unique})
+    repeated_letter = words.map({word: len(set(word)) < len(word) for word in unique})
+    repeated_pattern = (
+        patterns.groupby([patterns.index, patterns]).transform("size").gt(1)
+    )
+    per_text = pd.DataFrame(
+        dict(
+            mean_word_length=lengths,
+            short_word_share=lengths.le(3),
+            repeated_letter_share=repeated_letter,
+            repeated_pattern_share=repeated_pattern,
+        )
+    ).astype(float)
+    word_features = per_text.groupby(level=0).mean().reindex(lowered.index)
+
+    features = pd.DataFrame(
+        dict(
+            log_letters=np.log2(np.maximum(letters, 1)),
+            distinct_letters=(counts > 0).sum(axis=1),
+            entropy=entropy,
+            punctuation_density=(
+                lowered.str.count(r"[^\w\s]") / lowered.str.len().clip(lower=1)
+            ).to_numpy(),
+        )
+    )
+    for column in word_features:
+        features[column] = word_features[column].to_numpy()
+    return features[list(FEATURES)].fillna(0.0)
+
+
+def score(
+    features: pd.DataFrame,
+    weights: dict[str, float] = DIFFICULTY_WEIGHTS,
+    intercept: float = INTERCEPT,
+) -> pd.Series:
+    """Difficulty from 0 (easy) to 10 (hard); cheap enough to rerun on every call."""
+    raw = features[list(weights)].to_numpy() @ np.array(list(weights.values()))
+    return pd.Series(np.clip(intercept + raw, 0, 10), index=features.index)
+
+
+class FeatureCache:
+    """Features per content hash, so only new or edited texts are measured."""
+
+    def __init__(self, path: str = FEATURES_PATH) -> None:
+        self.path = path
+        self.features = pd.DataFrame(columns=list(FEATURES), dtype=float)
+        self.features.index.name = "hash"
+        self.dirty = False
+
+    def lookup(self, texts: Sequence[str]) -> pd.DataFrame:
+        hashes = [content_hash(text) for text in texts]
+        missing = {
+            key: text
+            for key, text in zip(hashes, texts)
+            if key not in self.features.index
+        }
+        if missing:
+            computed = compute_features(list(missing.values()))
+            computed.index = pd.Index(list(missing), name="hash")
+            self.features = (
+                pd.concat([self.features, computed]) if len(self.features) else computed
+            )
+            self.dirty = True
+        return self.features.loc[hashes]
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        self.features.to_csv(tmp_path)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str = FEATURES_PATH) -> "FeatureCache":
+        cache = cls(path)
+        if os.path.exists(path):
+            cache.features = pd.read_csv(path, index_col="hash", dtype={"hash": str})
+        return cache
+
+
+_cache: FeatureCache | None = None
+
+
+def get_feature_cache() -> FeatureCache:
+    global _cache
+    if _cache is None:
+        _cache = FeatureCache.load()
+    return _cache
+
+
+@traced()
+def difficulty_scores(records: Iterable[tuple[str, dict[str, Any]]]) -> pd.Series:
+    """Difficulty per puzzle ID for `(puzzle ID, record)` pairs."""
+    ids: list[str] = []
+    texts: list[str] = []
+    for puzzle_id, record in records:
+        ids.append(puzzle_id)
+        texts.append(str(record["string_to_encrypt"]))
+    cache = get_feature_cache()
+    features = cache.lookup(texts)
+    cache.save()
+    features.index = pd.Index(ids, name="id")
+    return score(features)
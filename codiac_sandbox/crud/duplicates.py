@@ -0,0 +1,165 @@
+import hashlib
+import re
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from codiac_sandbox.crud.read import MASTER_LIST, iter_json_array
+from codiac_sandbox.crud.store import get_store
+
+TEXT_KEYS = ("string_to_encrypt", "quote", "lyrics", "phrase")
+
+SHINGLE_SIZE = 4
+BANDS = 16
+ROWS = 4
+NUM_HASHES = BANDS * ROWS
+PRIME = (1 << 31) - 1
+
+# fixed permutations so signatures are comparable across runs
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, PRIME, NUM_HASHES, dtype=np.uint64)
+_B = _rng.integers(0, PRIME, NUM_HASHES, dtype=np.uint64)
+
+
+def normalize(text: str) -> str:
+    text = text.lower().replace("'", "").replace("’", "")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+def shingles(text: str) -> set[str]:
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str) -> np.ndarray:
+    hashed = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest())
+            for s in shingles(text)
+        ),
+        dtype=np.uint64,
+    )
+    return ((_A[:, None] * hashed[None, :] + _B[:, None]) % PRIME).min(axis=1)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures bucketed by LSH bands.
+
+    A query only compares against puzzles sharing at least one band, so a
+    lookup costs a handful of dict probes instead of a pass over the corpus.
+    With 16 bands of 4 rows, pairs around 0.5 Jaccard similarity or more
+    almost always collide.
+    """
+
+    def __init__(self) -> None:
+        self.signatures: dict[str, np.ndarray] = {}
+        self.buckets: dict[tuple[int, bytes], list[str]] = {}
+
+    def add(self, key: str, text: str) -> None:
+        sig = signature(text)
+        self.signatures[key] = sig
+        for band in self._bands(sig):
+            self.buckets.setdefault(band, []).append(key)
+
+    def query(self, text: str, threshold: float = 0.6) -> list[tuple[str, float]]:
+        """Keys whose estimated similarity to `text` is at least `threshold`, best first."""
+        return self._query(signature(text), threshold)
+
+    def _query(
+        self, sig: np.ndarray, threshold: float, exclude: str | None = None
+    ) -> list[tuple[str, float]]:
+        candidates = {
+            key
+            for band in self._bands(sig)
+            for key in self.buckets.get(band, ())
+            if key != exclude
+        }
+        scored = [
+            (key, float((self.signatures[key] == sig).mean())) for key in candidates
+        ]
+        return sorted(
+            (item for item in scored if item[1] >= threshold),
+            key=lambda item: -item[1],
+        )
+
+    def clusters(self, threshold: float = 0.6) -> list[list[str]]:
+        parent = {key: key for key in self.signatures}
+
+        def find(key: str) -> str:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for key, sig in self.signatures.items():
+            for other, _ in self._query(sig, threshold, exclude=key):
+                parent[find(other)] = find(key)
+
+        groups: dict[str, list[str]] = {}
+        for key in self.signatures:
+            groups.setdefault(find(key), []).append(key)
+        return [group for group in groups.values() if len(group) > 1]
+
+    @staticmethod
+    def _bands(sig: np.ndarray) -> Iterator[tuple[int, bytes]]:
+        for band in range(BANDS):
+            yield band, sig[band * ROWS : (band + 1) * ROWS].tobytes()
+
+
+def record_text(record: Any) -> str | None:
+    if isinstance(record, dict):
+        for key in TEXT_KEYS:
+            if isinstance(record.get(key), str):
+                return record[key]
+    return None
+
+
+def iter_list_texts(path: str) -> Iterator[tuple[str, str]]:
+    """`(location, text)` for every puzzle in a JSON list of puzzle records."""
+    for i, record in enumerate(iter_json_array(path)):
+        if (text := record_text(record)) is not None:
+            yield f"{path}#{i}", text
+
+
+def find_duplicate_clusters(
+    paths: Iterable[str] = (MASTER_LIST,), threshold: float = 0.6
+) -> list[list[tuple[str, str]]]:
+    """
+    Near-duplicate groups across puzzle lists, by default the master list
+    alone; scheduled files are renders of its puzzles, so they are left out.
+    """
+    index = NearDuplicateIndex()
+    texts: dict[str, str] = {}
+    for path in paths:
+        for location, text in iter_list_texts(path):
+            texts[location] = text
+            index.add(location, text)
+    return [
+        [(location, texts[location]) for location in cluster]
+        for cluster in index.clusters(threshold)
+    ]
+
+
+_index: NearDuplicateIndex | None = None
+
+
+def get_duplicate_index() -> NearDuplicateIndex:
+    global _index
+    if _index is None:
+        _index = NearDuplicateIndex()
+        for puzzle_id, record in get_store().items():
+            _index.add(puzzle_id, record["string_to_encrypt"])
+    return _index
+
+
+def find_near_duplicates(text: str, threshold: float = 0.6) -> list[tuple[str, float]]:
+    """Stored puzzles that look like `text`, as `(puzzle ID, similarity)`."""
+    return get_duplicate_index().query(text, threshold)
+
+
+def index_duplicate(puzzle_id: str, text: str) -> None:
+    if _index is not None:
+        _index.add(puzzle_id, text)
@@ -0,0 +1,176 @@
+import json
+import random
+from typing import Any, Iterable, Iterator, TypeVar
+
+from codiac_sandbox.crud.snapshot import open_snapshot
+from codiac_sandbox.crud.store import get_store
+from codiac_sandbox.puzzle_types import CryptographBase
+from codiac_sandbox.resources import resource_path
+from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES, parse_puzzle
+
+MASTER_LIST = resource_path("master-puzzle-list.json")
+OLD_LIST = resource_path("old-puzzle-list.json")
+
+CHUNK_SIZE = 1 << 16
+
+T = TypeVar("T")
+
+
+def get_record(puzzle_id: str) -> dict[str, Any]:
+    return get_store().get(puzzle_id)
+
+
+def get_puzzle(puzzle_id: str) -> CryptographBase:
+    return parse_puzzle(get_record(puzzle_id))
+
+
+def iter_records() -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Every stored `(puzzle ID, record)`, read from the columnar snapshot of the
+    last compaction with the writes logged since laid over it.
+    """
+    store = get_store()
+    snapshot = open_snapshot(store)
+    if snapshot is None:
+        yield from store.items()
+        return
+
+    changed: dict[str, dict[str, Any]] = {}
+    removed: set[str] = set()
+    for puzzle_id, record in store.iter_log(store.compacted_offset):
+        if record is None:
+            removed.add(puzzle_id)
+            changed.pop(puzzle_id, None)
+        else:
+            # a puzzle deleted and re-added since moves to the end, as in the store
+            changed[puzzle_id] = record
+
+    for puzzle_id, record in snapshot:
+        if puzzle_id in removed:
+            continue
+        yield puzzle_id, changed.pop(puzzle_id, record)
+    yield from changed.items()
+
+
+def get_difficulty(puzzle_id: str) -> float:
+    # numpy and pandas load on first use, keeping headless imports light
+    from codiac_sandbox.crud.difficulty import difficulty_scores
+
+    return float(difficulty_scores([(puzzle_id, get_record(puzzle_id))]).iloc[0])
+
+
+def get_difficulty_scores() -> dict[str, float]:
+    """Puzzle ID -> difficulty from 0 (easy) to 10 (hard) for every stored puzzle."""
+    from codiac_sandbox.crud.difficulty import difficulty_scores
+
+    return difficulty_scores(iter_records()).to_dict()
+
+
+def is_used(record: dict[str, Any]) -> bool:
+    # records saved through the editor carry stringified values
+    return record.get("used") in (True, "True")
+
+
+def iter_json_array(
+    path: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Yield the elements of a top-level JSON array, holding one chunk in memory."""
+    decoder = json.JSONDecoder()
+    with open(path) as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        started = False
+        while True:
+            # skip whitespace and separators, refilling as needed
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    break
+                buffer, pos = f.read(chunk_size), 0
+                eof = not buffer
+
+            if pos == len(buffer):
+                if started:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                return
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                element, end = None, len(buffer)
+            # an element ending exactly at the buffer edge may still be truncated
+            if end == len(buffer) and not eof:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield element  # type: ignore[misc]
+            pos = end
+
+
+def matches(
+    record: dict[str, Any],
+    types: Iterable[str] | None = None,
+    used: bool | None = None,
+) -> bool:
+    if types is not None and record["type"] not in types:
+        return False
+    return used is None or is_used(record) == used
+
+
+def to_puzzle(record: dict[str, Any]) -> CryptographBase:
+    if "string_to_encrypt" in record:
+        return parse_puzzle(record)
+    # old-puzzle-list.json stores constructor arguments instead
+    kwargs = {k: v for k, v in record.items() if k != "type"}
+    return PUZZLE_CLASSES[record["type"]](**kwargs)
+
+
+def iter_puzzles(
+    path: str = MASTER_LIST,
+    types: Iterable[str] | None = None,
+    used: bool | None = None,
+) -> Iterator[CryptographBase]:
+    """Stream puzzles from a corpus file, filtering on the raw records before parsing."""
+    if types is not None:
+        types = set(types)
+    for record in iter_json_array(path):
+        if matches(record, types, used):
+            yield to_puzzle(record)
+
+
+def reservoir_sample(
+    items: Iterable[T], k: int, rng: random.Random | None = None
+) -> list[T]:
+    """Uniform sample of `k` items from a stream of unknown length, in random order."""
+    rng = rng or random.Random()
+    sample: list[T] = []
+    for i, item in enumerate(items):
+        if i < k:
+            sample.append(item)
+        elif (j := rng.randrange(i + 1)) < k:
+            sample[j] = item
+    rng.shuffle(sample)
+    return sample
+
+
+def sample_puzzles(
+    k: int,
+    path: str = MASTER_LIST,
+    types: Iterable[str] | None = None,
+    used: bool | None = False,
+    rng: random.Random | None = None,
+) -> list[CryptographBase]:
+    return reservoir_sample(iter_puzzles(path, types, used), k, rng)
@@ -0,0 +1,215 @@
+import bisect
+import json
+import os
+import re
+from typing import Any, Iterable
+
+from codiac_sandbox.crud.store import STORE_DIR, PuzzleStore, get_store
+
+INDEX_PATH = os.path.join(STORE_DIR, "search-index.json")
+INDEX_VERSION = 1
+
+SEARCH_FIELDS = (
+    "string_to_encrypt",
+    "author",
+    "source",
+    "character_name",
+    "artist",
+    "title",
+)
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.lower().replace("'", ""))
+
+
+def trigrams(term: str) -> set[str]:
+    return {term[i : i + 3] for i in range(len(term) - 2)}
+
+
+class SearchIndex:
+    """
+    Inverted index from terms to puzzles, per field.
+
+    Plain query terms match as prefixes through a sorted vocabulary, terms
+    starting with `*` match as substrings through a trigram index over the
+    vocabulary, and `field:term` restricts a term to one field. All terms
+    must match. The index is persisted with the store generation and log
+    offset it reflects, so opening it only replays newer store writes.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+        self.generation = -1
+        self.log_offset = 0
+
+    def _reset(self) -> None:
+        self.ids: list[str | None] = []
+        self.doc_index: dict[str, int] = {}
+        self.postings: dict[str, dict[str, set[int]]] = {}
+        self.vocabulary: list[str] = []
+        self.trigrams: dict[str, set[str]] = {}
+
+    def add(self, puzzle_id: str, record: dict[str, Any]) -> None:
+        self.remove(puzzle_id)
+        doc = len(self.ids)
+        self.ids.append(puzzle_id)
+        self.doc_index[puzzle_id] = doc
+        for field in SEARCH_FIELDS:
+            value = record.get(field)
+            if value is None:
+                continue
+            for term in tokenize(str(value)):
+                self._postings_for(term).setdefault(field, set()).add(doc)
+
+    def remove(self, puzzle_id: str) -> None:
+        # postings keep the stale document number until the next full rebuild
+        doc = self.doc_index.pop(puzzle_id, None)
+        if doc is not None:
+            self.ids[doc] = None
+
+    def search(self, query: str, limit: int | None = None) -> list[str]:
+        matched: set[int] | None = None
+        for field, term in self._parse(query):
+            docs = self._match(term, field)
+            matched = docs if matched is None else matched & docs
+            if not matched:
+                return []
+        if matched is None:
+            return []
+        found = [self.ids[doc] for doc in sorted(matched) if self.ids[doc] is not None]
+        return found[:limit]  # type: ignore[return-value]
+
+    def sync(self, store: PuzzleStore) -> None:
+        """Bring the index up to date with the store, rebuilding after a compaction."""
+        if self.generation != store.generation:
+            self._reset()
+            for puzzle_id, record in store.items():
+                self.add(puzzle_id, record)
+        else:
+            for puzzle_id, data in store.iter_log(self.log_offset):
+                if data is None:
+                    self.remove(puzzle_id)
+                else:
+                    self.add(puzzle_id, data)
+        self.mark_synced(store)
+
+    def mark_synced(self, store: PuzzleStore) -> None:
+        self.generation = store.generation
+        self.log_offset = store.log_offset
+
+    def save(self, path: str = INDEX_PATH) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                dict(
+                    version=INDEX_VERSION,
+                    generation=self.generation,
+                    log_offset=self.log_offset,
+                    ids=self.ids,
+                    postings={
+                        term: {field: sorted(docs) for field, docs in fields.items()}
+                        for term, fields in self.postings.items()
+                    },
+                ),
+                f,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = INDEX_PATH) -> "SearchIndex":
+        index = cls()
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return index
+        if saved["version"] != INDEX_VERSION:
+            return index
+        index.generation = saved["generation"]
+        index.log_offset = saved["log_offset"]
+        index.ids = saved["ids"]
+        index.doc_index = {id_: doc for doc, id_ in enumerate(index.ids) if id_}
+        index.postings = {
+            term: {field: set(docs) for field, docs in fields.items()}
+            for term, fields in saved["postings"].items()
+        }
+        index.vocabulary = sorted(index.postings)
+        for term in index.vocabulary:
+            for trigram in trigrams(term):
+                index.trigrams.setdefault(trigram, set()).add(term)
+        return index
+
+    def _postings_for(self, term: str) -> dict[str, set[int]]:
+        if term not in self.postings:
+            self.postings[term] = {}
+            bisect.insort(self.vocabulary, term)
+            for trigram in trigrams(term):
+                self.trigrams.setdefault(trigram, set()).add(term)
+        return self.postings[term]
+
+    def _parse(self, query: str) -> Iterable[tuple[str | None, str]]:
+        for word in query.split():
+            field: str | None = None
+            if ":" in word:
+                field, word = word.split(":", 1)
+                if field not in SEARCH_FIELDS:
+                    # not a field: search both halves as ordinary terms
+                    field, word = None, f"{field}:{word}"
+            substring = word.startswith("*")
+            for term in tokenize(word):
+                yield field, f"*{term}" if substring else term
+
+    def _match(self, term: str, field: str | None) -> set[int]:
+        docs: set[int] = set()
+        for candidate in self._terms(term):
+            fields = self.postings[candidate]
+            if field is None:
+                for field_docs in fields.values():
+                    docs |= field_docs
+            elif field in fields:
+                docs |= fields[field]
+        return docs
+
+    def _terms(self, term: str) -> Iterable[str]:
+        if not term.startswith("*"):
+            start = bisect.bisect_left(self.vocabulary, term)
+            end = bisect.bisect_left(self.vocabulary, term + "\uffff")
+            return self.vocabulary[start:end]
+
+        term = term[1:]
+        if len(term) < 3:
+            return [candidate for candidate in self.vocabulary if term in candidate]
+        candidates: set[str] | None = None
+        for trigram in trigrams(term):
+            found = self.trigrams.get(trigram, set())
+            candidates = found if candidates is None else candidates & found
+        return [candidate for candidate in candidates or () if term in candidate]
+
+
+_index: SearchIndex | None = None
+
+
+def get_search_index() -> SearchIndex:
+    """The index, caught up with every store write so far; a no-op replay is one seek."""
+    global _index
+    if _index is None:
+        _index = SearchIndex.load()
+    _index.sync(get_store())
+    return _index
+
+
+def index_puzzle(puzzle_id: str, record: dict[str, Any]) -> None:
+    """
+    Keep an already loaded index current after `puzzle_id` was stored; an
+    unloaded one catches up from the store log. The whole log tail is
+    replayed, so updates and deletes made since are not skipped.
+    """
+    if _index is not None:
+        _index.sync(get_store())
+
+
+def loaded_search_index() -> SearchIndex | None:
+    return _index
@@ -0,0 +1,245 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Iterable, Iterator
+
+from codiac_sandbox.crud.store import STORE_DIR, PuzzleStore
+from codiac_sandbox.utils.tracing import traced
+
+SNAPSHOT_PATH = os.path.join(STORE_DIR, "master.snapshot")
+MAGIC = b"CODIACS1"
+MISSING = 0xFFFFFFFF
+
+# magic, then the byte length of the JSON header that follows it
+_PREAMBLE = struct.Struct(f"<{len(MAGIC)}sI")
+
+
+_CONSTANTS = {"true": True, "false": False, "null": None}
+
+
+def _loads(text: str) -> Any:
+    # most JSON cells are the `used` flag, which needs no parser
+    return _CONSTANTS[text] if text in _CONSTANTS else json.loads(text)
+
+
+def _align(f: Any) -> None:
+    f.write(b"\0" * (-f.tell() % 4))
+
+
+@traced()
+def write_snapshot(
+    path: str, source_digest: str, rows: Iterable[tuple[str, dict[str, Any]]]
+) -> None:
+    """
+    Write `(puzzle ID, record)` rows as columns of interned string IDs.
+
+    Each column holds one uint32 per row pointing into a shared string table
+    (or MISSING), so repeated authors, sources and types are stored once.
+    Columns whose values are not all strings hold their values as JSON text.
+    """
+    rows = list(rows)
+    names = list(dict.fromkeys(name for _, record in rows for name in record))
+    json_columns = {
+        name
+        for _, record in rows
+        for name, value in record.items()
+        if not isinstance(value, str)
+    }
+
+    strings: dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if (string_id := strings.get(value)) is None:
+            string_id = strings[value] = len(strings)
+        return string_id
+
+    columns = {"id": array("I", (intern(puzzle_id) for puzzle_id, _ in rows))}
+    for name in names:
+        encode = json.dumps if name in json_columns else str
+        columns[name] = array(
+            "I",
+            (
+                intern(encode(record[name])) if name in record else MISSING
+                for _, record in rows
+            ),
+        )
+
+    encoded = [s.encode() for s in strings]
+    offsets = array("I", [0])
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+
+    header = json.dumps(
+        dict(
+            source_digest=source_digest,
+            rows=len(rows),
+            strings=len(encoded),
+            columns=[
+                dict(name=name, kind="json" if name in json_columns else "str")
+                for name in columns
+            ],
+        )
+    ).encode()
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, len(header)))
+        f.write(header)
+        _align(f)
+        f.write(offsets.tobytes())
+        for column in columns.values():
+            f.write(column.tobytes())
+        for blob in encoded:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Columns and the string offsets are `memoryview`s cast straight over the
+    mapping, so opening costs no parsing. Single cells decode just their
+    string; whole columns decode the shared string table once, so a repeated
+    value is only decoded the first time.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = self._view = memoryview(self._mmap)
+        magic, header_length = _PREAMBLE.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a puzzle snapshot")
+        start = _PREAMBLE.size
+        header = json.loads(bytes(view[start : start + header_length]))
+        self.source_digest: str = header["source_digest"]
+        self.rows: int = header["rows"]
+
+        position = start + header_length
+        position += -position % 4
+        offsets_size = 4 * (header["strings"] + 1)
+        self._offsets = view[position : position + offsets_size].cast("I")
+        position += offsets_size
+
+        self.columns: dict[str, memoryview] = {}
+        self._json_columns: set[str] = set()
+        for column in header["columns"]:
+            self.columns[column["name"]] = view[
+                position : position + 4 * self.rows
+            ].cast("I")
+            if column["kind"] == "json":
+                self._json_columns.add(column["name"])
+            position += 4 * self.rows
+        self._strings = view[position:]
+        self._strings_decoded: list[str] | None = None
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self) -> None:
+        """Unmap the file; the views over it can no longer be read."""
+        for column in self.columns.values():
+            column.release()
+        self._offsets.release()
+        self._strings.release()
+        self._view.release()
+        self._mmap.close()
+
+    def string(self, string_id: int) -> str:
+        return str(
+            self._strings[self._offsets[string_id] : self._offsets[string_id + 1]],
+            "utf-8",
+        )
+
+    def value(self, column: str, row: int) -> Any:
+        string_id = self.columns[column][row]
+        if string_id == MISSING:
+            return None
+        text = self.string(string_id)
+        return _loads(text) if column in self._json_columns else text
+
+    def column(self, name: str) -> list[Any]:
+        """Every row's value for `name`, with None where a record lacks it."""
+        strings = self._string_table()
+        if name not in self._json_columns:
+            return [
+                None if string_id == MISSING else strings[string_id]
+                for string_id in self.columns[name]
+            ]
+        return [
+            None if string_id == MISSING else _loads(strings[string_id])
+            for string_id in self.columns[name]
+        ]
+
+    def record(self, row: int) -> dict[str, Any]:
+        return {
+            name: self.value(name, row)
+            for name, column in self.columns.items()
+            if name != "id" and column[row] != MISSING
+        }
+
+    def __iter__(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        names = [name for name in self.columns if name != "id"]
+        columns = [self.column(name) for name in names]
+        present = [self.columns[name] for name in names]
+        for row, puzzle_id in enumerate(self.column("id")):
+            yield puzzle_id, {
+                name: column[row]
+                for name, column, ids in zip(names, columns, present)
+                if ids[row] != MISSING
+            }
+
+    def _string_table(self) -> list[str]:
+        if self._strings_decoded is None:
+            blob = self._strings.tobytes()
+            offsets = self._offsets.tolist()
+            self._strings_decoded = [
+                blob[start:end].decode() for start, end in zip(offsets, offsets[1:])
+            ]
+        return self._strings_decoded
+
+
+# path -> (inode, size, mtime) of the mapped file, and its mapping
+_mapped: dict[str, tuple[tuple[int, int, int], Snapshot]] = {}
+
+
+def map_snapshot(path: str) -> Snapshot | None:
+    """The mapping of `path`, reused until the file is replaced."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        release_snapshot(path)
+        return None
+    fingerprint = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    cached = _mapped.get(path)
+    if cached is None or cached[0] != fingerprint:
+        release_snapshot(path)
+        cached = _mapped[path] = (fingerprint, Snapshot(path))
+    return cached[1]
+
+
+def release_snapshot(path: str) -> None:
+    """Close the cached mapping of `path`, if any."""
+    cached = _mapped.pop(path, None)
+    if cached is not None:
+        cached[1].close()
+
+
+def open_snapshot(store: PuzzleStore, path: str = SNAPSHOT_PATH) -> Snapshot | None:
+    """
+    The snapshot of the store's last compacted state, rebuilt when the JSON's
+    digest has moved on. Returns None when it would need a rebuild while the
+    store has pending writes, since those rows no longer match the JSON.
+    """
+    snapshot = map_snapshot(path)
+    if snapshot is not None and snapshot.source_digest == store.source_digest:
+        return snapshot
+    if store.pending():
+        return None
+    # a file that is still mapped cannot be replaced on Windows
+    release_snapshot(path)
+    write_snapshot(path, store.source_digest, store.items())
+    return map_snapshot(path)
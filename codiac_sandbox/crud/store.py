@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+from typing import Any, Iterable, Iterator
+
+from codiac_sandbox.resources import resource_path
+from codiac_sandbox.utils.tracing import traced
+
+STORE_DIR = resource_path("store")
+SOURCE_PATH = resource_path("master-puzzle-list.json")
+
+LOG_FILE = "puzzles.log"
+INDEX_FILE = "index.json"
+
+
+def puzzle_id(data: dict[str, Any], occurrence: int = 0) -> str:
+    """
+    Content-derived ID for a puzzle entering the store. It is not recomputed
+    later: compaction writes it into the master list, and rebuilding the
+    store keeps whatever ID a record carries, so edits do not change it.
+    """
+    key = f"{data['type']}\x00{data['string_to_encrypt']}"
+    if occurrence:
+        key += f"\x00{occurrence}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def file_fingerprint(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PuzzleStore:
+    """
+    Append-only log of puzzle records with an offset index.
+
+    Every create, update and delete is a single line appended to the log, and
+    the in-memory index maps each live puzzle ID to the byte range of its
+    latest record. The index is checkpointed to disk together with the log
+    offset it covers, so opening the store only replays the log tail.
+    `compact` rewrites the log and emits `master-puzzle-list.json` in the
+    usual format, each record carrying its ID.
+    """
+
+    def __init__(self, directory: str = STORE_DIR, source: str = SOURCE_PATH) -> None:
+        self.directory = directory
+        self.source = source
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.index: dict[str, tuple[int, int]] = {}
+        self.generation = 0
+        self.compacted_offset = 0
+        self.log_offset = 0
+        # sha256 of the JSON as of the last bootstrap or compaction
+        self.source_digest = ""
+        # sha256 of the JSON a compaction in progress is replacing the source with
+        self.compacting_digest = ""
+        self._source_fingerprint: tuple[int, ...] = ()
+
+        os.makedirs(directory, exist_ok=True)
+        if not self._load_index():
+            self._bootstrap()
+        elif self._source_changed():
+            if not self.pending():
+                self._bootstrap()
+            elif self._source_matches_index():
+                # a compaction stopped between replacing the JSON and the log
+                self._rewrite_log(list(self.items()))
+            else:
+                # the JSON moved under uncompacted writes, e.g. a pull: keep them on top
+                ops = list(self.iter_log(self.compacted_offset))
+                self._bootstrap()
+                self._append(ops)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self.index
+
+    def ids(self) -> list[str]:
+        return list(self.index)
+
+    def get(self, id_: str) -> dict[str, Any]:
+        offset, length = self.index[id_]
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))["data"]
+
+    def items(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        with open(self.log_path, "rb") as f:
+            for id_, (offset, length) in list(self.index.items()):
+                f.seek(offset)
+                yield id_, json.loads(f.read(length))["data"]
+
+    def new_id(self, data: dict[str, Any]) -> str:
+        occurrence = 0
+        while (id_ := puzzle_id(data, occurrence)) in self.index:
+            occurrence += 1
+        return id_
+
+    def add(self, data: dict[str, Any]) -> str:
+        return self.add_many([data])[0]
+
+    def add_many(self, records: list[dict[str, Any]]) -> list[str]:
+        ops: list[tuple[str, dict[str, Any] | None]] = []
+        ids: list[str] = []
+        for data in records:
+            id_ = self.new_id(data)
+            # reserve the ID so duplicates inside one batch get distinct IDs
+            self.index[id_] = (0, 0)
+            ops.append((id_, data))
+            ids.append(id_)
+        self._append(ops)
+        return ids
+
+    def update(self, id_: str, changes: dict[str, Any]) -> dict[str, Any]:
+        return self.update_many({id_: changes})[id_]
+
+    def update_many(
+        self, changes: dict[str, dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        updated = {id_: self.get(id_) | fields for id_, fields in changes.items()}
+        self._append(list(updated.items()))
+        return updated
+
+    def delete(self, id_: str) -> None:
+        if id_ not in self.index:
+            raise KeyError(id_)
+        self._append([(id_, None)])
+
+    def iter_log(self, since: int = 0) -> Iterator[tuple[str, dict[str, Any] | None]]:
+        """Yield `(id, data)` for every operation after `since`; `data` is None for deletes."""
+        with open(self.log_path, "rb") as f:
+            f.seek(since)
+            for line in f:
+                entry = json.loads(line)
+                yield entry["id"], entry.get("data")
+
+    def pending(self) -> bool:
+        return self.log_offset > self.compacted_offset
+
+    @traced("PuzzleStore.compact")
+    def compact(self) -> None:
+        items = list(self.items())
+        tmp_source = self.source + ".tmp"
+        with open(tmp_source, "w") as f:
+            json.dump(master_records(items), f, indent=2)
+        # checkpointed before the swap, so a crash after it is recognised on open
+        self.compacting_digest = file_digest(tmp_source)
+        self.checkpoint()
+        os.replace(tmp_source, self.source)
+        self._rewrite_log(items)
+
+    def checkpoint(self) -> None:
+        if self.log_offset == self.compacted_offset:
+            self._source_fingerprint = file_fingerprint(self.source)
+            self.source_digest = file_digest(self.source)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                dict(
+                    generation=self.generation,
+                    log_offset=self.log_offset,
+                    compacted_offset=self.compacted_offset,
+                    source_fingerprint=self._source_fingerprint,
+                    source_digest=self.source_digest,
+                    compacting_digest=self.compacting_digest,
+                    index=self.index,
+                ),
+                f,
+            )
+        os.replace(tmp_path, self.index_path)
+
+    def _rewrite_log(self, items: list[tuple[str, dict[str, Any]]]) -> None:
+        ops: list[tuple[str, dict[str, Any] | None]] = list(items)
+        tmp_path = self.log_path + ".tmp"
+        self.index = {}
+        self.log_offset = 0
+        with open(tmp_path, "wb") as f:
+            self._write_ops(f, ops)
+        os.replace(tmp_path, self.log_path)
+
+        self.generation += 1
+        self.compacted_offset = self.log_offset
+        self.compacting_digest = ""
+        self.checkpoint()
+
+    def _append(self, ops: list[tuple[str, dict[str, Any] | None]]) -> None:
+        with open(self.log_path, "ab") as f:
+            f.seek(0, os.SEEK_END)
+            self.log_offset = f.tell()
+            self._write_ops(f, ops)
+
+    def _write_ops(self, f: Any, ops: list[tuple[str, dict[str, Any] | None]]) -> None:
+        lines: list[bytes] = []
+        for id_, data in ops:
+            entry = dict(id=id_, data=data) if data is not None else dict(id=id_)
+            line = json.dumps(entry).encode() + b"\n"
+            if data is None:
+                self.index.pop(id_, None)
+            else:
+                self.index[id_] = (self.log_offset, len(line))
+            self.log_offset += len(line)
+            lines.append(line)
+        f.write(b"".join(lines))
+
+    def _load_index(self) -> bool:
+        if not (os.path.exists(self.index_path) and os.path.exists(self.log_path)):
+            return False
+        with open(self.index_path) as f:
+            saved = json.load(f)
+        self.generation = saved["generation"]
+        self.compacted_offset = saved["compacted_offset"]
+        self.log_offset = saved["log_offset"]
+        self._source_fingerprint = tuple(saved["source_fingerprint"])
+        self.source_digest = saved["source_digest"]
+        self.compacting_digest = saved.get("compacting_digest", "")
+        self.index = {k: (v[0], v[1]) for k, v in saved["index"].items()}
+
+        # replay whatever was appended after the last checkpoint
+        with open(self.log_path, "r+b") as f:
+            f.seek(self.log_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # the tail of an append cut short by a crash
+                    f.truncate(self.log_offset)
+                    break
+                entry = json.loads(line)
+                if "data" in entry:
+                    self.index[entry["id"]] = (self.log_offset, len(line))
+                else:
+                    self.index.pop(entry["id"], None)
+                self.log_offset += len(line)
+        return True
+
+    def _source_changed(self) -> bool:
+        if file_fingerprint(self.source) == self._source_fingerprint:
+            return False
+        return file_digest(self.source) != self.source_digest
+
+    def _source_matches_index(self) -> bool:
+        if file_digest(self.source) == self.compacting_digest:
+            return True
+        # imported here because crud.read builds on the store
+        from codiac_sandbox.crud.read import iter_json_array
+
+        return list(iter_json_array(self.source)) == master_records(self.items())
+
+    @traced("PuzzleStore.bootstrap")
+    def _bootstrap(self) -> None:
+        # imported here because crud.read builds on the store
+        from codiac_sandbox.crud.read import iter_json_array
+
+        records = list(iter_json_array(self.source))
+        ids = [data.pop("id", None) for data in records]
+        # IDs the JSON carries are kept; a repeated one is treated as missing
+        self.index = {}
+        for i, id_ in enumerate(ids):
+            if id_ in self.index:
+                ids[i] = None
+            elif id_ is not None:
+                self.index[id_] = (0, 0)
+        ops: list[tuple[str, dict[str, Any] | None]] = []
+        for id_, data in zip(ids, records):
+            if id_ is None:
+                id_ = self.new_id(data)
+                self.index[id_] = (0, 0)
+            ops.append((id_, data))
+
+        self.index = {}
+        self.log_offset = 0
+        with open(self.log_path, "wb") as f:
+            self._write_ops(f, ops)
+
+        self.generation += 1
+        self.compacted_offset = self.log_offset
+        self.compacting_digest = ""
+        self.checkpoint()
+
+
+def master_records(
+    items: Iterable[tuple[str, dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """The master list's records: each puzzle's data, led by its ID."""
+    return [{"id": id_, **data} for id_, data in items]
+
+
+_store: PuzzleStore | None = None
+
+
+def get_store() -> PuzzleStore:
+    global _store
+    if _store is None:
+        _store = PuzzleStore()
+    return _store
@@ -0,0 +1,26 @@
+from typing import Any
+
+from codiac_sandbox.crud.search import loaded_search_index
+from codiac_sandbox.crud.store import get_store
+
+
+def update_puzzle(puzzle_id: str, changes: dict[str, Any]) -> dict[str, Any]:
+    return get_store().update(puzzle_id, changes)
+
+
+def mark_used(puzzle_ids: list[str]) -> None:
+    get_store().update_many({id_: dict(used=True) for id_ in puzzle_ids})
+
+
+def compact() -> None:
+    store = get_store()
+    index = loaded_search_index()
+    if store.pending():
+        # a fully synced search index stays valid across the log rewrite
+        if index is not None:
+            index.sync(store)
+        store.compact()
+        if index is not None:
+            index.mark_synced(store)
+    if index is not None:
+        index.save()
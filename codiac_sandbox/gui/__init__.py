@@ -1,9 +1,11 @@
+from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import (
     QWidget,
     QPushButton,
     QVBoxLayout,
     QHBoxLayout,
 )
+from codiac_sandbox.crud.update import compact
 from codiac_sandbox.gui.new_puzzle_modal import AddPuzzleDialog
 from codiac_sandbox.gui.view_puzzles import PuzzleUI
 
@@ -19,7 +21,7 @@ class MainWindow(QWidget):
         # Top controls
         self.add_puzzle_button = QPushButton("Add Puzzle")
         self.add_puzzle_button.clicked.connect(self.open_add_puzzle_dialog)
-        
+
         top_controls_layout = QHBoxLayout()
         top_controls_layout.addWidget(self.add_puzzle_button)
         main_layout.addLayout(top_controls_layout)
@@ -32,3 +34,9 @@ class MainWindow(QWidget):
 
     def open_add_puzzle_dialog(self) -> None:
         AddPuzzleDialog().exec()
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        # fold the store's pending writes back into master-puzzle-list.json
+        self.puzzle_ui.stop_loading()
+        compact()
+        super().closeEvent(event)
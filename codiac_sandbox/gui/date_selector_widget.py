@@ -6,18 +6,32 @@ from PySide6.QtWidgets import (
     QPushButton,
     QLabel,
     QApplication,
+    QMessageBox,
 )
 from PySide6.QtCore import QDate, Qt
+from PySide6.QtGui import QColor, QTextCharFormat
 import sys
+from datetime import date
 
 from codiac_sandbox.puzzle_types import CryptographBase
+from codiac_sandbox.selection.calendar import DateTakenError, get_calendar
 from codiac_sandbox.selection.save_as_date import save_as_new_file
 
 
+def date_key(day: QDate) -> str:
+    return day.toString("yyyyMMdd")
+
+
 class DateSelectorWidget(QWidget):
-    def __init__(self, puzzle: CryptographBase) -> None:
+    def __init__(self, puzzle: CryptographBase, puzzle_id: str | None = None) -> None:
         super().__init__()
         self.puzzle = puzzle
+        self.puzzle_id = puzzle_id
+        self.calendar = get_calendar()
+
+        self.taken_format = QTextCharFormat()
+        self.taken_format.setBackground(QColor("#f4c7c3"))
+        self.free_format = QTextCharFormat()
 
         main_layout = QVBoxLayout()
 
@@ -31,6 +45,7 @@ class DateSelectorWidget(QWidget):
         self.date_edit.setDate(QDate.currentDate())
         self.date_edit.setMinimumDate(QDate.currentDate())
         self.date_edit.dateChanged.connect(self.on_date_changed)
+        self.date_edit.calendarWidget().currentPageChanged.connect(self.highlight_month)
         controls_layout.addWidget(self.date_edit)
 
         self.confirm_button = QPushButton("Confirm Date")
@@ -49,12 +64,58 @@ class DateSelectorWidget(QWidget):
         self.setWindowTitle("Date Selector")
 
         self.on_date_changed(self.date_edit.date())
+        self.highlight_month(
+            self.date_edit.date().year(), self.date_edit.date().month()
+        )
+
+    def highlight_month(self, year: int, month: int) -> None:
+        # the popup shows up to six weeks, spilling into the neighbouring months
+        calendar_widget = self.date_edit.calendarWidget()
+        day = QDate(year, month, 1).addDays(-7)
+        for _ in range(7 * 7):
+            taken = self.calendar.is_taken(date_key(day))
+            calendar_widget.setDateTextFormat(
+                day, self.taken_format if taken else self.free_format
+            )
+            day = day.addDays(1)
 
     def on_date_changed(self, selected_date: QDate) -> None:
+        messages = []
+        entries = self.calendar.entries(date_key(selected_date))
+        if entries:
+            messages.append(f"Already scheduled in {', '.join(entries)}")
+        if self.puzzle_id is not None:
+            scheduled = self.calendar.dates_for(self.puzzle_id)
+            if scheduled:
+                messages.append(f"This puzzle is scheduled on {', '.join(scheduled)}")
         if selected_date.dayOfWeek() == 7:
             self.message_label.setStyleSheet("color: red;")
-        else:
-            self.message_label.setText("")
+        self.message_label.setText("\n".join(messages))
+
+    def selected_day(self) -> date:
+        day = self.date_edit.date()
+        return date(day.year(), day.month(), day.day())
 
     def confirm_date(self) -> None:
-        save_as_new_file(puzzle=self.puzzle, date=self.date_edit.date())
+        try:
+            save_as_new_file(
+                puzzle=self.puzzle,
+                day=self.selected_day(),
+                puzzle_id=self.puzzle_id,
+            )
+        except DateTakenError as error:
+            answer = QMessageBox.question(
+                self, "Date taken", f"{error}.\n\nReplace the by-date file?"
+            )
+            if answer != QMessageBox.Yes:  # type: ignore[attr-defined]
+                return
+            save_as_new_file(
+                puzzle=self.puzzle,
+                day=self.selected_day(),
+                puzzle_id=self.puzzle_id,
+                overwrite=True,
+            )
+        self.highlight_month(
+            self.date_edit.date().year(), self.date_edit.date().month()
+        )
+        self.on_date_changed(self.date_edit.date())
@@ -10,11 +10,14 @@ from PySide6.QtWidgets import (
     QComboBox,
     QPushButton,
     QWidget,
+    QMessageBox,
 )
 
 from codiac_sandbox.crud.create import get_puzzle_parameters, save_puzzle
+from codiac_sandbox.crud.duplicates import find_near_duplicates
+from codiac_sandbox.crud.read import get_record
 from codiac_sandbox.puzzle_types import CryptographBase
-from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES
+from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES, SCHEMAS
 from PySide6.QtWidgets import QSizePolicy
 
 
@@ -75,15 +78,39 @@ class AddPuzzleDialog(QDialog):
                 if param.annotation != inspect.Parameter.empty
                 else ""
             )
-            if param.default != inspect.Parameter.empty:
+            if not param.required:
                 placeholder += f" (default: {param.default})"
             field.setPlaceholderText(placeholder.strip())
             self.fields[name] = field
             self.form_layout.addRow(QLabel(name), field)
 
     def save_puzzle(self) -> None:
-        save_puzzle(
-            PUZZLE_CLASSES[self.type_selector.currentText()],
-            {k: v.text() for k, v in self.fields.items()},  # type: ignore
-        )
+        schema = SCHEMAS[self.type_selector.currentText()]
+        kwargs = {
+            name: schema.fields[name].from_text(field.text())  # type: ignore[union-attr]
+            for name, field in self.fields.items()
+        }
+        if missing := schema.missing(kwargs):
+            QMessageBox.warning(
+                self, "Missing fields", f"Please fill in {', '.join(missing)}."
+            )
+            return
+        if not self.confirm_if_duplicate(schema.cls(**kwargs)):
+            return
+        save_puzzle(schema.cls, kwargs)
         self.update_form(self.type_selector.currentText())
+
+    def confirm_if_duplicate(self, puzzle: CryptographBase) -> bool:
+        matches = find_near_duplicates(puzzle.string_to_encrypt)
+        if not matches:
+            return True
+        similar = "\n".join(
+            f"{similarity:.0%}: {get_record(puzzle_id)['string_to_encrypt']}"
+            for puzzle_id, similarity in matches[:5]
+        )
+        answer = QMessageBox.question(
+            self,
+            "Possible duplicate",
+            f"Similar puzzles already exist:\n\n{similar}\n\nSave anyway?",
+        )
+        return answer == QMessageBox.Yes  # type: ignore[attr-defined]
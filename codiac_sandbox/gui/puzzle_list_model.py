@@ -0,0 +1,100 @@
+from typing import Any
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    QRect,
+    QSize,
+    Qt,
+)
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+PUZZLE_ROLE = 256  # Qt.UserRole
+PUZZLE_ID_ROLE = 257
+
+ModelIndex = QModelIndex | QPersistentModelIndex
+
+
+class PuzzleListModel(QAbstractListModel):
+    def __init__(self) -> None:
+        super().__init__()
+        # `(puzzle ID, record)`, as iter_records yields them
+        self._puzzles: list[tuple[str, dict[str, Any]]] = []
+
+    def set_puzzles(self, puzzles: list[tuple[str, dict[str, Any]]]) -> None:
+        # a reset is O(1); the view only asks for the rows it shows
+        self.beginResetModel()
+        self._puzzles = puzzles
+        self.endResetModel()
+
+    def append_puzzles(self, puzzles: list[tuple[str, dict[str, Any]]]) -> None:
+        """Extend the shown list (and the list it was set from) in place."""
+        if not puzzles:
+            return
+        start = len(self._puzzles)
+        self.beginInsertRows(QModelIndex(), start, start + len(puzzles) - 1)
+        self._puzzles.extend(puzzles)
+        self.endInsertRows()
+
+    def rowCount(self, parent: ModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._puzzles)
+
+    def data(self, index: ModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:  # type: ignore[assignment]
+        if not index.isValid():
+            return None
+        puzzle_id, record = self._puzzles[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return record["string_to_encrypt"]
+        if role == PUZZLE_ROLE:
+            return record
+        if role == PUZZLE_ID_ROLE:
+            return puzzle_id
+        return None
+
+
+class PuzzleItemDelegate(QStyledItemDelegate):
+    TEXT_WIDTH = 280
+    PADDING = 4
+    ALTERNATE_COLOR = QColor("#725656")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._heights: dict[str, int] = {}
+
+    def _text_rect(self, option: QStyleOptionViewItem) -> QRect:
+        rect: QRect = option.rect  # type: ignore[attr-defined]
+        return QRect(
+            rect.left() + self.PADDING,
+            rect.top() + self.PADDING,
+            self.TEXT_WIDTH,
+            rect.height() - 2 * self.PADDING,
+        )
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: ModelIndex
+    ) -> None:
+        painter.save()
+        if option.state & QStyle.State_Selected:  # type: ignore[attr-defined]
+            painter.fillRect(option.rect, option.palette.highlight())  # type: ignore[attr-defined]
+            painter.setPen(option.palette.highlightedText().color())  # type: ignore[attr-defined]
+        elif index.row() % 2 == 1:
+            painter.fillRect(option.rect, self.ALTERNATE_COLOR)  # type: ignore[attr-defined]
+        painter.drawText(
+            self._text_rect(option),
+            Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap,  # type: ignore[attr-defined]
+            index.data(),
+        )
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: ModelIndex) -> QSize:
+        text: str = index.data()
+        if text not in self._heights:
+            bounds = option.fontMetrics.boundingRect(  # type: ignore[attr-defined]
+                QRect(0, 0, self.TEXT_WIDTH, 1 << 16),
+                Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap,  # type: ignore[attr-defined]
+                text,
+            )
+            self._heights[text] = bounds.height() + 2 * self.PADDING
+        return QSize(self.TEXT_WIDTH + 2 * self.PADDING, self._heights[text])
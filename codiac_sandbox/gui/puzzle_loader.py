@@ -0,0 +1,42 @@
+from typing import Any
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from codiac_sandbox.crud.read import iter_records
+from codiac_sandbox.utils.tracing import traced
+
+# `(puzzle ID, record)` per category, in store order
+Groups = dict[str, list[tuple[str, dict[str, Any]]]]
+
+
+class PuzzleLoaderSignals(QObject):
+    # queued across threads, so slots run on the UI thread
+    chunk = Signal(object)
+    finished = Signal()
+
+
+class PuzzleLoader(QRunnable):
+    """Read and group the stored puzzles off the UI thread, a chunk at a time."""
+
+    CHUNK_SIZE = 2000
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.signals = PuzzleLoaderSignals()
+        self.cancelled = False
+
+    @traced("PuzzleLoader.run")
+    def run(self) -> None:
+        groups: Groups = {}
+        count = 0
+        for puzzle_id, record in iter_records():
+            if self.cancelled:
+                return
+            groups.setdefault(record["type"], []).append((puzzle_id, record))
+            count += 1
+            if count == self.CHUNK_SIZE:
+                self.signals.chunk.emit(groups)
+                groups, count = {}, 0
+        if groups:
+            self.signals.chunk.emit(groups)
+        self.signals.finished.emit()
@@ -1,32 +1,50 @@
 from PySide6.QtWidgets import (
     QVBoxLayout,
     QComboBox,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QWidget,
     QLabel,
     QHBoxLayout,
-    QSizePolicy,
-    QPushButton,
+    QLineEdit,
+    QProgressBar,
 )
 from PySide6.QtWidgets import QScrollArea
-from PySide6.QtGui import QColor, QBrush
 
-from PySide6.QtCore import Qt
-import json
+from PySide6.QtCore import QModelIndex, Qt, QThreadPool
+from bisect import bisect_left
 
+from codiac_sandbox.crud.read import get_record
+from codiac_sandbox.crud.search import get_search_index
+from codiac_sandbox.crud.store import get_store
 from codiac_sandbox.gui.date_selector_widget import DateSelectorWidget
-from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES, from_json
+from codiac_sandbox.gui.puzzle_list_model import (
+    PUZZLE_ID_ROLE,
+    PUZZLE_ROLE,
+    PuzzleItemDelegate,
+    PuzzleListModel,
+)
+from codiac_sandbox.gui.puzzle_loader import Groups, PuzzleLoader
+from codiac_sandbox.utils.puzzle_classes import parse_puzzle
+from codiac_sandbox.utils.tracing import traced
 
 
 class PuzzleUI(QWidget):
+    MAX_SEARCH_RESULTS = 500
+
     def __init__(self) -> None:
         self._layout = QVBoxLayout()
 
-        self.load_quotes()
+        self.quotes_by_category: Groups = {}
+        # category shown in the list, or None while it shows search results
+        self.displayed_category: str | None = None
+        # set once the user picks a category, which loading then leaves alone
+        self.category_picked = False
+        self.loaded_count = 0
         self.build_lists()
 
         self._layout.addWidget(self.category_combo)
+        self._layout.addWidget(self.search_box)
+        self._layout.addWidget(self.loading_bar)
 
         # Main content layout (quote list + detail view)
         self.main_content_layout = QHBoxLayout()
@@ -35,27 +53,75 @@ class PuzzleUI(QWidget):
         self.main_content_layout.addWidget(self.quote_list)
         self.main_content_layout.addWidget(self.detail_scroll_area)
 
-        self.display_quotes(list(self.quotes_by_category)[0])
+        self.load_quotes()
 
     def load_quotes(self) -> None:
-        with open("resources/master-puzzle-list.json") as f:
-            self.quotes_by_category: dict[str, list[dict]] = {}
-            for q in json.load(f):
-                self.quotes_by_category[q["type"]] = self.quotes_by_category.get(
-                    q["type"], []
-                ) + [q]
-        self.quotes_by_category = {
-            k: v for k, v in sorted(self.quotes_by_category.items())
-        }
+        # created here, not lazily on the loader's thread while the UI also asks for it
+        get_store()
+        self.loader = PuzzleLoader()
+        self.loader.signals.chunk.connect(self.add_quotes)
+        self.loader.signals.finished.connect(self.finish_loading)
+        QThreadPool.globalInstance().start(self.loader)
+
+    def stop_loading(self) -> None:
+        self.loader.cancelled = True
+        QThreadPool.globalInstance().waitForDone()
+
+    @traced("PuzzleUI.add_quotes")
+    def add_quotes(self, groups: Groups) -> None:
+        for category, quotes in groups.items():
+            if category not in self.quotes_by_category:
+                self.quotes_by_category[category] = []
+                categories = [
+                    self.category_combo.itemText(i)
+                    for i in range(self.category_combo.count())
+                ]
+                position = bisect_left(categories, category)
+                self.category_combo.insertItem(position, category)
+                if position == 0 and not self.category_picked:
+                    # show the alphabetically first category, whatever loads first
+                    self.category_combo.setCurrentIndex(0)
+            if category == self.displayed_category:
+                # the model holds this very list, so grow it through the model
+                self.quote_model.append_puzzles(quotes)
+            else:
+                self.quotes_by_category[category].extend(quotes)
+        self.loaded_count += sum(map(len, groups.values()))
+        self.loading_bar.setFormat(f"Loading puzzles… {self.loaded_count:,}")
+
+    def finish_loading(self) -> None:
+        self.loading_bar.hide()
+        self.search_box.setEnabled(True)
 
     def build_lists(self) -> None:
         self.category_combo = QComboBox()
         self.category_combo.addItems(list(self.quotes_by_category))
         self.category_combo.currentTextChanged.connect(self.display_quotes)
+        self.category_combo.activated.connect(self.pick_category)
         self.category_combo.setMaximumWidth(200)
 
-        self.quote_list = QListWidget()
-        self.quote_list.itemClicked.connect(self.display_quote_details)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search (author:twain, *substring)")
+        self.search_box.setMaximumWidth(450)
+        self.search_box.textChanged.connect(self.search_quotes)
+        # the search index reads the store, which the loader is still streaming
+        self.search_box.setEnabled(False)
+
+        self.loading_bar = QProgressBar()
+        self.loading_bar.setMaximumWidth(450)
+        self.loading_bar.setRange(0, 0)  # busy until the loader finishes
+        self.loading_bar.setFormat("Loading puzzles…")
+        self.loading_bar.setTextVisible(True)
+
+        self.quote_model = PuzzleListModel()
+        self.quote_delegate = PuzzleItemDelegate()
+        self.quote_list = QListView()
+        self.quote_list.setModel(self.quote_model)
+        self.quote_list.setItemDelegate(self.quote_delegate)
+        # lay rows out in batches so only the visible ones are measured up front
+        self.quote_list.setLayoutMode(QListView.Batched)  # type: ignore[attr-defined]
+        self.quote_list.setBatchSize(100)
+        self.quote_list.clicked.connect(self.display_quote_details)
         self.quote_list.setFixedWidth(450)  # Set fixed width here
 
         # Container for labels in the detail view
@@ -69,54 +135,35 @@ class PuzzleUI(QWidget):
         self.detail_scroll_area.setWidgetResizable(True)
         self.detail_scroll_area.setWidget(self.detail_view_container)
 
-    from PySide6.QtGui import QColor, QBrush
+    def pick_category(self) -> None:
+        self.category_picked = True
 
+    @traced("PuzzleUI.display_quotes")
     def display_quotes(self, category: str) -> None:
-        self.quote_list.clear()
-        for i, quote in enumerate(self.quotes_by_category[category]):
-            text = quote["string_to_encrypt"]
-
-            label = QLabel(text)
-            label.setWordWrap(True)
-            label.setStyleSheet("padding: 4px;")
-            label.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Minimum)  # type: ignore[attr-defined]
-            label.setFixedWidth(280)
-            label.setAlignment(Qt.AlignLeft | Qt.AlignTop)  # type: ignore[attr-defined]
-
-            h_layout = QHBoxLayout()
-            h_layout.setAlignment(Qt.AlignLeft)  # type: ignore[attr-defined]
-            h_layout.addWidget(label)
-            h_layout.setContentsMargins(0, 0, 0, 0)
-            h_layout.setSpacing(6)
-
-            widget = QWidget()
-            widget.setLayout(h_layout)
-
-            item = QListWidgetItem()
-            item.setSizeHint(widget.sizeHint())
-
-            # Set background tint on the QListWidgetItem, not the widget
-            if i % 2 == 1:
-                item.setBackground(
-                    QBrush(QColor("#725656"))
-                )  # Light gray for alternating rows
-
-            self.quote_list.addItem(item)
-            self.quote_list.setItemWidget(item, widget)
-
-            item.setData(256, quote)
-
-    def display_quote_details(self, item: QListWidgetItem) -> None:
+        self.displayed_category = category
+        self.quote_model.set_puzzles(self.quotes_by_category[category])
+
+    def search_quotes(self, query: str) -> None:
+        if not query.strip():
+            self.display_quotes(self.category_combo.currentText())
+            return
+        ids = get_search_index().search(query, limit=self.MAX_SEARCH_RESULTS)
+        self.displayed_category = None
+        self.quote_model.set_puzzles([(id_, get_record(id_)) for id_ in ids])
+
+    def display_quote_details(self, index: QModelIndex) -> None:
         # Clear previous labels
         for i in reversed(range(self.detail_view_layout.count())):
             child = self.detail_view_layout.itemAt(i).widget()
             if child:
                 child.deleteLater()
 
-        puzzle_data: dict = item.data(256)
-        puzzle = from_json(PUZZLE_CLASSES[puzzle_data.pop("type")], puzzle_data)
+        record = index.data(PUZZLE_ROLE)
+        puzzle = parse_puzzle(record)
 
-        self.detail_view_layout.addWidget(DateSelectorWidget(puzzle))
+        self.detail_view_layout.addWidget(
+            DateSelectorWidget(puzzle, index.data(PUZZLE_ID_ROLE))
+        )
 
         for key, value in puzzle.to_json().items():
             if key in ["string_to_encrypt", "type"]:
@@ -1,8 +1,14 @@
 class HintBase:
+    __slots__: tuple[str, ...] = ()
+
     def to_json(self) -> dict[str, str]:
-        return self.__dict__ | dict(type=self.__class__.__name__)
+        return {name: getattr(self, name) for name in self.__slots__} | dict(
+            type=self.__class__.__name__
+        )
 
 
 class GiveALetterHint(HintBase):
+    __slots__ = ("letter",)
+
     def __init__(self, letter: str) -> None:
         self.letter = letter
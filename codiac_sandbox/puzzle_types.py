@@ -1,48 +1,121 @@
 import random
-from typing import Any, Self
+from sys import intern
+from functools import cache
+from typing import Any, Callable, ClassVar, Self
 from abc import ABC, abstractmethod
 
 from codiac_sandbox.hint_types import GiveALetterHint, HintBase
-from codiac_sandbox.utils.make_letter_map import get_new_letter_map
+from codiac_sandbox.utils.make_letter_map import ALPHABET, get_new_letter_map
+from codiac_sandbox.utils.tracing import traced
+
+
+def interned(value: Any) -> Any:
+    # metadata repeats across puzzles; older records also hold ints and None
+    return intern(value) if type(value) is str else value
 
 
 class CryptographBase(ABC):
+    """
+    A puzzle and its metadata, laid out for holding very many at once.
+
+    Attributes live in `__slots__`, and metadata strings (types, sources,
+    authors) are interned so repeats share one object. The letter map is
+    kept as 26 icons in alphabet order and the hints as the string of
+    letters in the order they are given; both are drawn on first access.
+    """
+
+    # constructor argument -> the record key holding it, or a function of the
+    # record; arguments not listed are read from the key of the same name
+    JSON_KEYS: ClassVar[dict[str, str | Callable[[dict[str, Any]], Any]]] = {}
+
+    __slots__ = (
+        "string_to_encrypt",
+        "puzzle_type",
+        "used",
+        "_base_hints",
+        "_rng",
+        "_icons",
+        "_hint_letters",
+    )
+
+    # abstract so only the concrete puzzle classes, which each declare their
+    # own arguments for the schema registry, can be instantiated
+    @abstractmethod
     def __init__(
         self,
         string_to_encrypt: str,
         puzzle_type: str = "Undefined",
         hints: list[HintBase] | None = None,
         used: bool = False,
-        **kwargs: str,
     ) -> None:
-        if hints is None:
-            hints = []
         self.string_to_encrypt = string_to_encrypt
-        self.puzzle_type = puzzle_type
-        self.encryption_map = get_new_letter_map(string_to_encrypt)
-        letters = list(
-            s for s in string_to_encrypt.lower() if s in "qwertyuiopasdfghjklzxcvbnm"
-        )
-        random.shuffle(letters)
-        self.hints = hints + [GiveALetterHint(letter) for letter in letters]
+        self.puzzle_type = interned(puzzle_type)
+        self._base_hints = tuple(hints or ())
+        self._rng: random.Random | None = None
+        self._icons: tuple[str | None, ...] | None = None
+        self._hint_letters: str | None = None
         self.used = used
-        for key, value in kwargs.items():
-            setattr(self, key, value)
 
+    @classmethod
+    @cache
+    def field_names(cls) -> tuple[str, ...]:
+        """Public attributes, base class first, in the order they are serialized."""
+        return tuple(
+            name
+            for klass in reversed(cls.__mro__)
+            for name in getattr(klass, "__slots__", ())
+            if not name.startswith("_")
+        )
+
+    # built on first access only; browsing and non-frontend JSON never need them
+    @property
+    def encryption_map(self) -> dict[str, str]:
+        if self._icons is None:
+            self.encryption_map = get_new_letter_map(self.string_to_encrypt, self._rng)
+        assert self._icons is not None
+        return {
+            letter: icon
+            for letter, icon in zip(ALPHABET, self._icons)
+            if icon is not None
+        }
+
+    @encryption_map.setter
+    def encryption_map(self, mapping: dict[str, str]) -> None:
+        self._icons = tuple(mapping.get(letter) for letter in ALPHABET)
+
+    @property
+    def hints(self) -> list[HintBase]:
+        if self._hint_letters is None:
+            letters = [s for s in self.string_to_encrypt.lower() if s in ALPHABET]
+            (self._rng or random).shuffle(letters)
+            self._hint_letters = "".join(dict.fromkeys(letters))
+        return [
+            *self._base_hints,
+            *(GiveALetterHint(letter) for letter in self._hint_letters),
+        ]
+
+    @hints.setter
+    def hints(self, hints: list[HintBase]) -> None:
+        letters = [h.letter for h in hints if isinstance(h, GiveALetterHint)]
+        self._base_hints = tuple(h for h in hints if not isinstance(h, GiveALetterHint))
+        self._hint_letters = "".join(dict.fromkeys(letters))
+
+    def seed(self, seed: str) -> Self:
+        """Make the letter map and hint order a pure function of `seed`."""
+        self._rng = random.Random(seed)
+        self._icons = None
+        self._hint_letters = None
+        return self
+
+    def _fields(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.field_names()}
+
+    @traced("CryptographBase.to_json")
     def to_json(
         self, to_read_from_frontend: bool = False
     ) -> dict[str, list | str | dict[str, str]]:
         res: dict[str, Any]
-        data = self.__dict__.copy()
-        hints: list[dict[str, Any]] = []
-        hint: HintBase
-        seen_letters: set[str] = set()
-        for hint in data["hints"]:
-            if isinstance(hint, GiveALetterHint):
-                if hint.letter not in seen_letters:
-                    seen_letters.add(hint.letter)
-                    hints.append(hint.to_json())
-        data["hints"] = hints
+        data = self._fields()
 
         if not to_read_from_frontend:
             res = data
@@ -55,16 +128,25 @@ class CryptographBase(ABC):
                 )
                 | res
             )
-            res |= dict(
-                hints=None,
-                encryption_map=None,
-            )
         else:
+            # same draw order as the old eager constructor: letter map, then hints
+            encryption_map = self.encryption_map
+            hints: list[dict[str, Any]] = []
+            hint: HintBase
+            seen_letters: set[str] = set()
+            for hint in self.hints:
+                if isinstance(hint, GiveALetterHint):
+                    if hint.letter not in seen_letters:
+                        seen_letters.add(hint.letter)
+                        hints.append(hint.to_json())
+
             res = {}
             for key in ["used"]:
                 del data[key]
-            for key in ["puzzle_type", "string_to_encrypt", "hints", "encryption_map"]:
+            for key in ["puzzle_type", "string_to_encrypt"]:
                 res[key] = data.pop(key)
+            res["hints"] = hints
+            res["encryption_map"] = encryption_map
 
             res["other_info"] = {
                 k.replace("_", " ").title(): str(v)
@@ -76,27 +158,29 @@ class CryptographBase(ABC):
         return {k: str(v) for k, v in res.items() if v is not None}
 
     @classmethod
-    @abstractmethod
     def from_json(cls, data: dict[str, Any]) -> Self:
-        """Create an instance from JSON data. Must be implemented by subclasses."""
-        pass
+        """Create an instance from a stored record, through the class's schema."""
+        from codiac_sandbox.utils.puzzle_classes import get_schema
+
+        return get_schema(cls).parse(data)  # type: ignore[return-value]
 
 
 class ListPuzzle(CryptographBase):
+    __slots__ = ("setup",)
+    JSON_KEYS = {"elements": lambda data: data["string_to_encrypt"].split()}
+
     def __init__(self, setup: str, elements: list[str], used: bool = False) -> None:
         super().__init__(" ".join(elements), "list", used=used)
         self.setup = setup
 
-    @classmethod
-    def from_json(cls, data: dict[str, Any]) -> Self:
-        return cls(
-            setup=data["setup"],
-            elements=data["string_to_encrypt"].split(),
-            used=data["used"],
-        )
-
 
 class CharacterQuote(CryptographBase):
+    __slots__ = ("character_name", "source", "date")
+    JSON_KEYS = {
+        "quote": "string_to_encrypt",
+        "source_type": lambda data: data["puzzle_type"].split(" ")[0],
+    }
+
     def __init__(
         self,
         quote: str,
@@ -107,23 +191,15 @@ class CharacterQuote(CryptographBase):
         used: bool = False,
     ):
         super().__init__(quote, f"{source_type} Quote", used=used)
-        self.character_name = character_name
-        self.source = source
-        self.date = date
-
-    @classmethod
-    def from_json(cls, data: dict[str, Any]) -> Self:
-        return cls(
-            quote=data["string_to_encrypt"],
-            source_type=data["puzzle_type"].split(" ")[0],
-            character_name=data["character_name"],
-            source=data["source"],
-            date=data["date"],
-            used=data["used"],
-        )
+        self.character_name = interned(character_name)
+        self.source = interned(source)
+        self.date = interned(date)
 
 
 class FamousDocumentQuote(CryptographBase):
+    __slots__ = ("source", "author", "date")
+    JSON_KEYS = {"quote": "string_to_encrypt"}
+
     def __init__(
         self,
         quote: str,
@@ -133,26 +209,15 @@ class FamousDocumentQuote(CryptographBase):
         used: bool = False,
     ):
         super().__init__(quote, "Famous Document", used=used)
-        self.source = source
-        self.author = author
-        self.date = date
-
-    @classmethod
-    def from_json(
-        cls,
-        data: dict[str, Any],
-        used: bool = False,
-    ) -> Self:
-        return cls(
-            quote=data["string_to_encrypt"],
-            source=data["source"],
-            author=data["author"],
-            date=data["date"],
-            used=data["used"],
-        )
+        self.source = interned(source)
+        self.author = interned(author)
+        self.date = interned(date)
 
 
 class DirectQuote(CryptographBase):
+    __slots__ = ("author", "date")
+    JSON_KEYS = {"quote": "string_to_encrypt"}
+
     def __init__(
         self,
         quote: str,
@@ -161,20 +226,14 @@ class DirectQuote(CryptographBase):
         used: bool = False,
     ) -> None:
         super().__init__(quote, "Direct Quote", used=used)
-        self.author = author
-        self.date = date
-
-    @classmethod
-    def from_json(cls, data: dict[str, Any]) -> Self:
-        return cls(
-            quote=data["string_to_encrypt"],
-            author=data["author"],
-            date=data.get("date"),
-            used=data["used"],
-        )
+        self.author = interned(author)
+        self.date = interned(date)
 
 
 class GeneralPhrase(CryptographBase):
+    __slots__ = ()
+    JSON_KEYS = {"phrase": "string_to_encrypt"}
+
     def __init__(
         self,
         phrase: str,
@@ -182,12 +241,11 @@ class GeneralPhrase(CryptographBase):
     ):
         super().__init__(phrase, "General Quote", used=used)
 
-    @classmethod
-    def from_json(cls, data: dict[str, Any]) -> Self:
-        return cls(phrase=data["string_to_encrypt"], used=data["used"])
-
 
 class SongLyrics(CryptographBase):
+    __slots__ = ("artist", "title", "date")
+    JSON_KEYS = {"lyrics": "string_to_encrypt"}
+
     def __init__(
         self,
         lyrics: str,
@@ -197,22 +255,15 @@ class SongLyrics(CryptographBase):
         used: bool = False,
     ) -> None:
         super().__init__(lyrics, "Song lyrics", used=used)
-        self.artist = artist
-        self.title = title
-        self.date = date
-
-    @classmethod
-    def from_json(cls, data: dict[str, Any]) -> Self:
-        return cls(
-            lyrics=data["string_to_encrypt"],
-            artist=data["artist"],
-            title=data["title"],
-            date=data["date"],
-            used=data["used"],
-        )
+        self.artist = interned(artist)
+        self.title = interned(title)
+        self.date = interned(date)
 
 
 class Riddle(CryptographBase):
+    __slots__ = ("question",)
+    JSON_KEYS = {"answer": "string_to_encrypt"}
+
     def __init__(
         self,
         question: str,
@@ -222,16 +273,11 @@ class Riddle(CryptographBase):
         super().__init__(answer, "Riddle", used=used)
         self.question = question
 
-    @classmethod
-    def from_json(cls, data: dict[str, Any]) -> Self:
-        return cls(
-            question=data["question"],
-            answer=data["string_to_encrypt"],
-            used=data["used"],
-        )
-
 
 class RiddleSolvedInReverse(CryptographBase):
+    __slots__ = ("answer",)
+    JSON_KEYS = {"question": "string_to_encrypt"}
+
     def __init__(
         self,
         question: str,
@@ -241,12 +287,6 @@ class RiddleSolvedInReverse(CryptographBase):
         super().__init__(question, "Reverse Riddle", used=used)
         self.answer = answer
 
-    @classmethod
-    def from_json(cls, data: dict[str, Any]) -> Self:
-        return cls(
-            question=data["string_to_encrypt"], answer=data["answer"], used=data["used"]
-        )
-
 
 PuzzleClass = (
     ListPuzzle
@@ -0,0 +1,20 @@
+import json
+import os
+from functools import cache
+from typing import Any
+
+# the repository's resources/ directory, wherever the process was started from
+RESOURCES_DIR = os.environ.get("CODIAC_RESOURCES") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources"
+)
+
+
+def resource_path(*parts: str) -> str:
+    return os.path.join(RESOURCES_DIR, *parts)
+
+
+@cache
+def load_resource(name: str) -> Any:
+    """Parse a JSON file under resources/ once per process."""
+    with open(resource_path(name)) as f:
+        return json.load(f)
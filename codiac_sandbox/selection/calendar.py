@@ -0,0 +1,168 @@
+import json
+import os
+from datetime import date
+from typing import Any, Iterator
+
+from codiac_sandbox.crud.read import iter_records
+from codiac_sandbox.resources import resource_path
+
+CALENDAR_PATH = resource_path("calendar.json")
+CALENDAR_VERSION = 1
+SCHEDULE_DIRS = (resource_path("by-date"), resource_path("auto-generated"))
+
+# directory name -> {"id": puzzle ID or None, "seeded": True for seeded renders}
+Entries = dict[str, dict[str, Any]]
+
+
+class DateTakenError(Exception):
+    def __init__(self, key: str, entries: Entries) -> None:
+        super().__init__(f"{key} is already scheduled in {', '.join(entries)}")
+        self.key = key
+        self.entries = entries
+
+
+def date_key(day: date) -> str:
+    return day.strftime("%Y%m%d")
+
+
+class Calendar:
+    """
+    Date -> scheduled puzzles across every schedule directory, and the reverse.
+
+    The index is committed next to the dated files it describes. Opening it
+    lists the directories once to pick up files written by other tools;
+    after that lookups and writes never touch the directories.
+    """
+
+    def __init__(self, path: str = CALENDAR_PATH) -> None:
+        self.path = path
+        self.dates: dict[str, Entries] = {}
+        self.by_puzzle: dict[str, set[str]] = {}
+
+    def is_taken(self, key: str) -> bool:
+        return key in self.dates
+
+    def entries(self, key: str) -> Entries:
+        return self.dates.get(key, {})
+
+    def dates_for(self, puzzle_id: str) -> list[str]:
+        return sorted(self.by_puzzle.get(puzzle_id, ()))
+
+    def seeded_dates(self, directory: str) -> Iterator[tuple[str, str]]:
+        """`(date key, puzzle ID)` for every seeded render in `directory`."""
+        name = os.path.basename(directory)
+        for key, entries in self.dates.items():
+            entry = entries.get(name)
+            if entry and entry.get("seeded") and entry["id"]:
+                yield key, entry["id"]
+
+    def assign(
+        self,
+        key: str,
+        directory: str,
+        puzzle_id: str | None,
+        seeded: bool = False,
+    ) -> None:
+        name = os.path.basename(directory)
+        self.unassign(key, directory)
+        entry: dict[str, Any] = {"id": puzzle_id}
+        if seeded:
+            entry["seeded"] = True
+        self.dates.setdefault(key, {})[name] = entry
+        if puzzle_id is not None:
+            self.by_puzzle.setdefault(puzzle_id, set()).add(key)
+
+    def unassign(self, key: str, directory: str) -> None:
+        entries = self.dates.get(key)
+        if not entries:
+            return
+        entry = entries.pop(os.path.basename(directory), None)
+        if not entries:
+            del self.dates[key]
+        if entry and entry["id"] is not None:
+            keys = self.by_puzzle[entry["id"]]
+            # the puzzle may still sit on this date in another directory
+            if not any(e["id"] == entry["id"] for e in entries.values()):
+                keys.discard(key)
+            if not keys:
+                del self.by_puzzle[entry["id"]]
+
+    def save(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                dict(
+                    version=CALENDAR_VERSION,
+                    dates={
+                        key: dict(sorted(entries.items()))
+                        for key, entries in sorted(self.dates.items())
+                    },
+                ),
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path: str = CALENDAR_PATH) -> "Calendar":
+        calendar = cls(path)
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return calendar
+        if saved["version"] != CALENDAR_VERSION:
+            return calendar
+        for key, entries in saved["dates"].items():
+            for name, entry in entries.items():
+                calendar.assign(key, name, entry["id"], entry.get("seeded", False))
+        return calendar
+
+    def reconcile(self, directories: tuple[str, ...] = SCHEDULE_DIRS) -> bool:
+        """Catch up with files added or removed behind the index's back."""
+        changed = False
+        lookup: dict[str, str] | None = None
+        for directory in directories:
+            name = os.path.basename(directory)
+            on_disk = {
+                file.removesuffix(".json")
+                for file in (os.listdir(directory) if os.path.isdir(directory) else ())
+                if file.endswith(".json")
+            }
+            indexed = {key for key, entries in self.dates.items() if name in entries}
+            for key in indexed - on_disk:
+                self.unassign(key, directory)
+                changed = True
+            for key in sorted(on_disk - indexed):
+                if lookup is None:
+                    lookup = _text_lookup()
+                self.assign(key, directory, _identify(directory, key, lookup))
+                changed = True
+        return changed
+
+
+def _text_lookup() -> dict[str, str]:
+    # dated files only keep the lowercased text, so match on that
+    lookup: dict[str, str] = {}
+    for puzzle_id, record in iter_records():
+        lookup.setdefault(str(record["string_to_encrypt"]).lower(), puzzle_id)
+    return lookup
+
+
+def _identify(directory: str, key: str, lookup: dict[str, str]) -> str | None:
+    with open(os.path.join(directory, f"{key}.json")) as f:
+        text = json.load(f).get("string_to_encrypt", "")
+    return lookup.get(text.lower())
+
+
+_calendar: Calendar | None = None
+
+
+def get_calendar() -> Calendar:
+    global _calendar
+    if _calendar is None:
+        _calendar = Calendar.load()
+        if _calendar.reconcile():
+            _calendar.save()
+    return _calendar
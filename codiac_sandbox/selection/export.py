@@ -0,0 +1,211 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+from contextlib import suppress
+from types import ModuleType
+from typing import Any, Iterator
+
+from codiac_sandbox.resources import resource_path
+from codiac_sandbox.selection.calendar import SCHEDULE_DIRS, Calendar, get_calendar
+from codiac_sandbox.utils.tracing import traced
+
+EXPORT_DIR = resource_path("bundles")
+EXPORT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+SHARD_FILE = re.compile(r"\d{6}\.json(\.gz|\.br)?")
+
+# precompressed variants, named the way static file servers look for them
+ENCODINGS = {"gzip": ".gz", "br": ".br"}
+
+
+def brotli_module() -> ModuleType | None:
+    # a declared dependency, but a checkout without it still exports gzip
+    try:
+        import brotli  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return brotli
+
+
+def scheduled_files(calendar: Calendar) -> Iterator[tuple[str, str]]:
+    """`(date key, path)` in date order; hand-picked by-date files win over generated ones."""
+    for key in sorted(calendar.dates):
+        entries = calendar.dates[key]
+        for directory in SCHEDULE_DIRS:
+            if os.path.basename(directory) in entries:
+                yield key, os.path.join(directory, f"{key}.json")
+                break
+
+
+def _file_digest(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class ShardWriter:
+    """
+    One month's bundle: a JSON object of date -> puzzle, one date per line,
+    compressed while it is written. `commit` swaps the files in for the
+    previous export, only when the bundle's bytes changed, so an unchanged
+    month is not rewritten.
+    """
+
+    def __init__(self, directory: str, month: str, brotli: ModuleType | None) -> None:
+        self.path = os.path.join(directory, f"{month}.json")
+        self.offset = 0
+        self.digest = hashlib.sha256()
+        self.encodings: list[str] = []
+        self.closed = False
+        self.unchanged = False
+        self._files = {"": open(self.path + ".tmp", "wb")}
+        self._files[".gz"] = open(self.path + ".gz.tmp", "wb")
+        # mtime=0 keeps the gzip bytes a function of the content alone
+        self._gzip = gzip.GzipFile(
+            filename="", mode="wb", fileobj=self._files[".gz"], mtime=0
+        )
+        self._brotli = None
+        if brotli is not None:
+            self._files[".br"] = open(self.path + ".br.tmp", "wb")
+            self._brotli = brotli.Compressor(quality=11)
+
+    def write(self, data: bytes) -> None:
+        self._files[""].write(data)
+        self._gzip.write(data)
+        if self._brotli is not None:
+            self._files[".br"].write(self._brotli.process(data))
+        self.digest.update(data)
+        self.offset += len(data)
+
+    def close(self) -> bool:
+        """Finish the bundle; returns False when it matched the previous export."""
+        self._gzip.close()
+        if self._brotli is not None:
+            self._files[".br"].write(self._brotli.finish())
+        for f in self._files.values():
+            f.close()
+        self.closed = True
+
+        self.unchanged = _file_digest(self.path) == self.digest.hexdigest() and all(
+            os.path.exists(self.path + suffix) for suffix in self._files
+        )
+        self.encodings = [
+            name
+            for name, suffix in ENCODINGS.items()
+            if (
+                os.path.exists(self.path + suffix)
+                if self.unchanged
+                else suffix in self._files
+            )
+        ]
+        return not self.unchanged
+
+    def commit(self) -> None:
+        """Replace the previous export with the closed bundle."""
+        for suffix in self._files:
+            if self.unchanged:
+                os.remove(self.path + suffix + ".tmp")
+            else:
+                os.replace(self.path + suffix + ".tmp", self.path + suffix)
+        if not self.unchanged and ".br" not in self._files:
+            # an older brotli variant no longer matches the bundle
+            if os.path.exists(self.path + ".br"):
+                os.remove(self.path + ".br")
+
+    def abort(self) -> None:
+        """Drop the new bundle, leaving the previous export in place."""
+        if not self.closed:
+            self.closed = True
+            with suppress(Exception):
+                self._gzip.close()
+        for suffix, f in self._files.items():
+            f.close()
+            with suppress(FileNotFoundError):
+                os.remove(self.path + suffix + ".tmp")
+
+
+@traced()
+def export_bundles(directory: str = EXPORT_DIR) -> dict[str, bool]:
+    """
+    Stream every scheduled puzzle into month bundles under `directory`, plus
+    a manifest mapping each date to its shard and the byte range of its
+    puzzle in the uncompressed bundle. Only one puzzle is held at a time.
+    No file is replaced until every bundle and the manifest are written.
+    Returns month -> whether its bundle changed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    brotli = brotli_module()
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    shards: dict[str, dict[str, Any]] = {}
+    changed: dict[str, bool] = {}
+    finished: list[ShardWriter] = []
+    shard: ShardWriter | None = None
+    month = None
+
+    def finish_shard() -> None:
+        assert shard is not None and month is not None
+        shard.write(b"\n}\n")
+        changed[month] = shard.close()
+        finished.append(shard)
+        shards[month] = dict(
+            file=os.path.basename(shard.path),
+            bytes=shard.offset,
+            sha256=shard.digest.hexdigest(),
+            encodings=shard.encodings,
+        )
+
+    try:
+        with open(manifest_path + ".tmp", "w") as manifest:
+            manifest.write(f'{{\n  "version": {EXPORT_VERSION},\n  "dates": {{')
+            separator = "\n"
+            for key, path in scheduled_files(get_calendar()):
+                if key[:6] != month:
+                    if shard is not None:
+                        finish_shard()
+                    month = key[:6]
+                    shard = ShardWriter(directory, month, brotli)
+                    shard.write(b"{")
+                else:
+                    assert shard is not None
+                    shard.write(b",")
+                with open(path, "rb") as f:
+                    puzzle = json.dumps(json.load(f), separators=(",", ":")).encode()
+                shard.write(f'\n"{key}": '.encode())
+                entry = dict(shard=month, offset=shard.offset, length=len(puzzle))
+                shard.write(puzzle)
+                manifest.write(f"{separator}    {json.dumps(key)}: {json.dumps(entry)}")
+                separator = ",\n"
+            if shard is not None:
+                finish_shard()
+            manifest.write('\n  },\n  "shards": ')
+            manifest.write(json.dumps(shards, indent=2).replace("\n", "\n  "))
+            manifest.write("\n}\n")
+    except BaseException:
+        # no half-written bundles or manifest left next to the last export
+        if shard is not None and not shard.closed:
+            shard.abort()
+        for done in finished:
+            done.abort()
+        with suppress(FileNotFoundError):
+            os.remove(manifest_path + ".tmp")
+        raise
+
+    for done in finished:
+        done.commit()
+    with open(manifest_path + ".tmp", "rb") as f:
+        unchanged = (
+            _file_digest(manifest_path) == hashlib.file_digest(f, "sha256").hexdigest()
+        )
+    if unchanged:
+        os.remove(manifest_path + ".tmp")
+    else:
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+    for name in os.listdir(directory):
+        if SHARD_FILE.fullmatch(name) and name[:6] not in shards:
+            os.remove(os.path.join(directory, name))
+    return changed
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+from typing import Any
+
+from codiac_sandbox.resources import RESOURCES_DIR, resource_path
+from codiac_sandbox.selection.calendar import Calendar, get_calendar
+from codiac_sandbox.selection.render_cache import (
+    icons_digest,
+    puzzle_content,
+    puzzle_seed,
+)
+from codiac_sandbox.utils.serializer import SERIALIZER_VERSION
+
+MANIFEST_PATH = resource_path("manifest.json")
+MANIFEST_VERSION = 1
+
+
+def source_hash(record: dict[str, Any]) -> str:
+    content = json.dumps(puzzle_content(record), sort_keys=True).encode()
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def manifest_name(path: str) -> str:
+    """Generated files are listed by their path under resources/, e.g. "by-date/20250711.json"."""
+    return os.path.relpath(path, RESOURCES_DIR).replace(os.sep, "/")
+
+
+def render_inputs(record: dict[str, Any], seed: str, fmt: str) -> dict[str, Any]:
+    return dict(
+        source=source_hash(record),
+        serializer=SERIALIZER_VERSION,
+        icons=icons_digest()[:16],
+        format=fmt,
+        seed=seed,
+    )
+
+
+class Manifest:
+    """
+    Generated file -> the puzzle, seed, format, serializer version and icon
+    set it was rendered from. Committed next to the files, so a rebuild only
+    touches the ones whose inputs moved.
+    """
+
+    def __init__(self, path: str = MANIFEST_PATH) -> None:
+        self.path = path
+        self.files: dict[str, dict[str, Any]] = {}
+
+    def record(
+        self,
+        path: str,
+        puzzle_id: str | None,
+        record: dict[str, Any],
+        seed: str,
+        fmt: str,
+    ) -> None:
+        self.files[manifest_name(path)] = dict(
+            id=puzzle_id, **render_inputs(record, seed, fmt)
+        )
+
+    def stale_reasons(
+        self, name: str, record: dict[str, Any], fmt: str | None = None
+    ) -> list[str]:
+        """Why `name` no longer matches what it would render to; empty when fresh."""
+        entry = self.files[name]
+        if "source" not in entry:
+            return ["not rendered through the manifest"]
+        current = render_inputs(record, entry["seed"], fmt or entry["format"])
+        return [
+            f"{field} changed"
+            for field, value in current.items()
+            if entry[field] != value
+        ]
+
+    def reconcile(self, calendar: Calendar) -> bool:
+        """Drop files the calendar no longer lists, and track its seeded renders."""
+        scheduled = {
+            f"{directory}/{key}.json": (key, entry)
+            for key, entries in calendar.dates.items()
+            for directory, entry in entries.items()
+        }
+        changed = False
+        for name in list(self.files):
+            if (
+                name not in scheduled
+                or scheduled[name][1]["id"] != self.files[name]["id"]
+            ):
+                del self.files[name]
+                changed = True
+        for name, (key, entry) in scheduled.items():
+            if name not in self.files and entry.get("seeded") and entry["id"]:
+                # seeded renders predating the manifest: the seed is known, the rest is not
+                self.files[name] = dict(
+                    id=entry["id"], seed=puzzle_seed(key, entry["id"]), format="legacy"
+                )
+                changed = True
+        return changed
+
+    def save(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                dict(version=MANIFEST_VERSION, files=dict(sorted(self.files.items()))),
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path: str = MANIFEST_PATH) -> "Manifest":
+        manifest = cls(path)
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return manifest
+        if saved["version"] == MANIFEST_VERSION:
+            manifest.files = saved["files"]
+        return manifest
+
+
+_manifest: Manifest | None = None
+
+
+def get_manifest() -> Manifest:
+    global _manifest
+    if _manifest is None:
+        _manifest = Manifest.load()
+        _manifest.reconcile(get_calendar())
+    return _manifest
@@ -0,0 +1,258 @@
+import json
+import os
+import random
+from typing import Any, Callable
+
+from codiac_sandbox.crud.read import is_used, iter_records
+from codiac_sandbox.crud.store import PuzzleStore
+from codiac_sandbox.resources import resource_path
+from codiac_sandbox.utils.tracing import traced
+
+QUEUE_DIR = resource_path("queues")
+QUEUE_VERSION = 1
+STATE_NAME = "state.json"
+# hand-edited: {"weights": {type: weight}, "max_run": n}
+CONFIG_NAME = "config.json"
+QUEUE_SUFFIX = ".txt"
+# a 12-digit puzzle ID and its newline; fixed width lets a pop seek to its line
+LINE_WIDTH = 13
+DEFAULT_WEIGHT = 1.0
+DEFAULT_MAX_RUN = 1
+
+
+class TypeQueue:
+    """
+    One type's unused puzzle IDs in shuffled order, one per line. `cursor`
+    counts the IDs already popped, so a pop is a single seek and read.
+    """
+
+    def __init__(self, path: str, cursor: int = 0) -> None:
+        self.path = path
+        self.cursor = cursor
+        try:
+            self.length = os.path.getsize(path) // LINE_WIDTH
+        except FileNotFoundError:
+            self.length = 0
+
+    def remaining(self) -> int:
+        return max(0, self.length - self.cursor)
+
+    def pop(self) -> str | None:
+        if not self.remaining():
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(self.cursor * LINE_WIDTH)
+            line = f.read(LINE_WIDTH)
+        self.cursor += 1
+        return line.decode().rstrip("\n")
+
+    def unpopped(self) -> list[str]:
+        if not self.remaining():
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.cursor * LINE_WIDTH)
+            return f.read().decode().split()
+
+    def rewrite(self, ids: list[str]) -> None:
+        """Replace the queue with `ids`, popped IDs dropped and the cursor reset."""
+        self.cursor = 0
+        self.length = len(ids)
+        if not ids:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        lines = [f"{id_}\n" for id_ in ids]
+        if any(len(line) != LINE_WIDTH for line in lines):
+            raise ValueError(
+                f"{self.path}: puzzle IDs must be {LINE_WIDTH - 1} characters"
+            )
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.path)
+
+
+class PuzzleQueues:
+    """
+    Unused puzzles in one shuffled queue per type, drawn from in turn.
+
+    Types take turns by smooth weighted round robin: every stocked type
+    earns its weight in credit each draw, and the richest pays the total
+    for its turn. No type is drawn more than `max_run` times in a row while
+    another has puzzles left. The queues and their cursors are committed
+    under resources/queues, so a draw does the same work however large the
+    master list grows; the queues are only rebuilt after the master list
+    changes behind their back.
+    """
+
+    def __init__(self, directory: str = QUEUE_DIR) -> None:
+        self.directory = directory
+        self.queues: dict[str, TypeQueue] = {}
+        self.credit: dict[str, float] = {}
+        self.weights: dict[str, float] = {}
+        self.max_run: int | None = DEFAULT_MAX_RUN
+        self.last_type: str | None = None
+        self.run = 0
+        # sha256 of the master list the queues were last synced with
+        self.source_digest = ""
+
+    def queue(self, type_: str) -> TypeQueue:
+        if type_ not in self.queues:
+            self.queues[type_] = TypeQueue(
+                os.path.join(self.directory, type_ + QUEUE_SUFFIX)
+            )
+        return self.queues[type_]
+
+    def weight(self, type_: str) -> float:
+        return self.weights.get(type_, DEFAULT_WEIGHT)
+
+    def remaining(self) -> dict[str, int]:
+        return {type_: queue.remaining() for type_, queue in self.queues.items()}
+
+    def _candidates(self, spent: set[str]) -> list[str]:
+        stocked = [
+            type_
+            for type_, queue in sorted(self.queues.items())
+            if type_ not in spent and self.weight(type_) > 0 and queue.remaining()
+        ]
+        if (
+            self.max_run is not None
+            and self.run >= self.max_run
+            and self.last_type in stocked
+            and len(stocked) > 1
+        ):
+            stocked.remove(self.last_type)
+        return stocked
+
+    def draw(self, live: Callable[[str], bool]) -> str | None:
+        """
+        Pop the next puzzle ID for which `live` holds, skipping IDs used or
+        deleted since the last sync; None once every queue is spent.
+        """
+        spent: set[str] = set()
+        while candidates := self._candidates(spent):
+            type_ = max(
+                candidates, key=lambda t: self.credit.get(t, 0.0) + self.weight(t)
+            )
+            queue = self.queues[type_]
+            while (id_ := queue.pop()) is not None:
+                if live(id_):
+                    break
+            if id_ is None:
+                spent.add(type_)
+                continue
+
+            for t in candidates:
+                self.credit[t] = self.credit.get(t, 0.0) + self.weight(t)
+            self.credit[type_] -= sum(map(self.weight, candidates))
+            self.run = self.run + 1 if type_ == self.last_type else 1
+            self.last_type = type_
+            return id_
+        return None
+
+    def is_synced(self, store: PuzzleStore) -> bool:
+        return self.source_digest == store.source_digest and not store.pending()
+
+    @traced("PuzzleQueues.sync")
+    def sync(self, store: PuzzleStore, rng: random.Random | None = None) -> bool:
+        """
+        Rebuild the queues if the master list moved since the last sync:
+        popped, used and deleted IDs are dropped and new unused puzzles are
+        shuffled in among the rest. Returns False, reading nothing, if not.
+        """
+        if self.is_synced(store):
+            return False
+        rng = rng or random.Random()
+        unused: dict[str, list[str]] = {}
+        for id_, record in iter_records():
+            if not is_used(record):
+                unused.setdefault(record["type"], []).append(id_)
+
+        os.makedirs(self.directory, exist_ok=True)
+        for type_ in sorted(set(self.queues) | set(unused)):
+            queue = self.queue(type_)
+            fresh = unused.get(type_, [])
+            wanted = set(fresh)
+            order = [id_ for id_ in queue.unpopped() if id_ in wanted]
+            queued = set(order)
+            # in ID order, so a seeded rng shuffles the same pool the same way
+            for id_ in sorted(fresh):
+                if id_ not in queued:
+                    # inside-out Fisher-Yates: a new puzzle lands anywhere in the queue
+                    order.append(id_)
+                    j = rng.randrange(len(order))
+                    order[j], order[-1] = order[-1], order[j]
+            queue.rewrite(order)
+            if not order:
+                del self.queues[type_]
+                self.credit.pop(type_, None)
+        self.mark_synced(store)
+        return True
+
+    def mark_synced(self, store: PuzzleStore) -> None:
+        """Record the store's master list as reflected, e.g. after compacting our own draws."""
+        self.source_digest = store.source_digest
+
+    def save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, STATE_NAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                dict(
+                    version=QUEUE_VERSION,
+                    source_digest=self.source_digest,
+                    cursors={
+                        type_: queue.cursor
+                        for type_, queue in sorted(self.queues.items())
+                    },
+                    credit=dict(sorted(self.credit.items())),
+                    last_type=self.last_type,
+                    run=self.run,
+                ),
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, directory: str = QUEUE_DIR) -> "PuzzleQueues":
+        queues = cls(directory)
+        config = _read_json(os.path.join(directory, CONFIG_NAME)) or {}
+        queues.weights = {k: float(v) for k, v in config.get("weights", {}).items()}
+        queues.max_run = config.get("max_run", DEFAULT_MAX_RUN)
+
+        saved = _read_json(os.path.join(directory, STATE_NAME))
+        if saved is None or saved["version"] != QUEUE_VERSION:
+            # an empty digest makes the next sync rebuild every queue
+            saved = {}
+        cursors = saved.get("cursors", {})
+        names = os.listdir(directory) if os.path.isdir(directory) else []
+        for name in sorted(names):
+            if name.endswith(QUEUE_SUFFIX):
+                type_ = name.removesuffix(QUEUE_SUFFIX)
+                queues.queue(type_).cursor = cursors.get(type_, 0)
+        queues.credit = saved.get("credit", {})
+        queues.last_type = saved.get("last_type")
+        queues.run = saved.get("run", 0)
+        queues.source_digest = saved.get("source_digest", "")
+        return queues
+
+
+def _read_json(path: str) -> Any:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+_queues: PuzzleQueues | None = None
+
+
+def get_queues() -> PuzzleQueues:
+    global _queues
+    if _queues is None:
+        _queues = PuzzleQueues.load()
+    return _queues
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import secrets
+from functools import cache
+from typing import Any
+
+from codiac_sandbox.crud.store import STORE_DIR
+from codiac_sandbox.utils.make_letter_map import get_icons
+from codiac_sandbox.utils.serializer import SERIALIZER_VERSION
+
+CACHE_DIR = os.path.join(STORE_DIR, "render-cache")
+
+
+@cache
+def icons_digest() -> str:
+    return hashlib.sha256(json.dumps(get_icons()).encode()).hexdigest()
+
+
+def puzzle_seed(key: str, puzzle_id: str) -> str:
+    return f"{key}:{puzzle_id}"
+
+
+def random_seed() -> str:
+    """A seed for unseeded renders, recorded so the file can be rebuilt."""
+    return secrets.token_hex(8)
+
+
+def puzzle_content(record: dict[str, Any]) -> dict[str, Any]:
+    # `used` flips once a puzzle is scheduled but never reaches the frontend
+    return {k: v for k, v in record.items() if k != "used"}
+
+
+def render_key(record: dict[str, Any], seed: str, fmt: str) -> str:
+    payload = json.dumps(
+        [SERIALIZER_VERSION, fmt, icons_digest(), seed, puzzle_content(record)],
+        sort_keys=True,
+    ).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def object_path(render_key: str) -> str:
+    return os.path.join(CACHE_DIR, "objects", render_key[:2], f"{render_key}.json")
+
+
+def load_object(render_key: str) -> bytes | None:
+    try:
+        with open(object_path(render_key), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def store_object(render_key: str, rendered: bytes) -> None:
+    path = object_path(render_key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(rendered)
@@ -1,13 +1,43 @@
 from datetime import date
-import json
 
+from codiac_sandbox.crud.store import get_store
 from codiac_sandbox.puzzle_types import CryptographBase
-from PySide6.QtCore import QDate, Qt
+from codiac_sandbox.resources import resource_path
+from codiac_sandbox.selection.calendar import DateTakenError, date_key, get_calendar
+from codiac_sandbox.selection.manifest import get_manifest
+from codiac_sandbox.selection.render_cache import random_seed
+from codiac_sandbox.utils.serializer import serialize_frontend
+from codiac_sandbox.utils.tracing import traced
 
+BY_DATE_DIR = resource_path("by-date")
 
-def save_as_new_file(puzzle: CryptographBase, date: QDate) -> None:
-    with open(
-        f"resources/by-date/{date.year():04d}{date.month():02d}{date.day():02d}.json",
-        "w",
-    ) as fp:
-        json.dump(puzzle.to_json(to_read_from_frontend=True), fp, indent=2)
+
+@traced()
+def save_as_new_file(
+    puzzle: CryptographBase,
+    day: date,
+    puzzle_id: str | None = None,
+    overwrite: bool = False,
+) -> None:
+    """Write `puzzle` as the by-date file for `day`, refusing taken dates unless `overwrite`."""
+    key = date_key(day)
+    calendar = get_calendar()
+    if calendar.is_taken(key) and not overwrite:
+        raise DateTakenError(key, calendar.entries(key))
+
+    # a recorded seed lets the manifest rebuild this file when its inputs move
+    seed = random_seed()
+    path = f"{BY_DATE_DIR}/{key}.json"
+    with open(path, "w") as fp:
+        fp.write(serialize_frontend(puzzle.seed(seed), legacy=True))
+    calendar.assign(key, BY_DATE_DIR, puzzle_id)
+    calendar.save()
+
+    if puzzle_id is None:
+        # the manifest keys rebuilds by puzzle ID, so an unsaved puzzle has none
+        return
+    store = get_store()
+    record = store.get(puzzle_id) if puzzle_id in store else puzzle.to_json()
+    manifest = get_manifest()
+    manifest.record(path, puzzle_id, record, seed, "legacy")
+    manifest.save()
@@ -0,0 +1,244 @@
+from datetime import date, timedelta
+import os
+import random
+import sys
+from typing import Any, Iterable
+
+from codiac_sandbox.crud.read import is_used, iter_records, reservoir_sample
+from codiac_sandbox.crud.store import get_store
+from codiac_sandbox.crud.update import compact, mark_used
+from codiac_sandbox.resources import resource_path
+from codiac_sandbox.selection.calendar import date_key, get_calendar
+from codiac_sandbox.selection.manifest import get_manifest
+from codiac_sandbox.selection.queues import get_queues
+from codiac_sandbox.selection.render_cache import (
+    load_object,
+    puzzle_seed,
+    random_seed,
+    render_key,
+    store_object,
+)
+from codiac_sandbox.utils.puzzle_classes import parse_puzzle
+from codiac_sandbox.utils.serializer import FORMATS, serialize_frontend
+from codiac_sandbox.utils.tracing import span, traced
+
+OUTPUT_DIR = resource_path("auto-generated")
+
+# output path, record, seed, output format, and whether to use the render cache
+RenderJob = tuple[str, dict[str, Any], str, str, bool]
+
+
+def date_range(start: date, days: int) -> list[date]:
+    return [start + timedelta(days=i) for i in range(days)]
+
+
+def free_dates(start: date, days: int) -> list[date]:
+    calendar = get_calendar()
+    return [
+        day for day in date_range(start, days) if not calendar.is_taken(date_key(day))
+    ]
+
+
+def render(record: dict[str, Any], seed: str, fmt: str) -> bytes:
+    puzzle = parse_puzzle(record).seed(seed)
+    return serialize_frontend(puzzle, **FORMATS[fmt]).encode()
+
+
+@traced()
+def render_puzzle(job: RenderJob) -> bool:
+    """Render one file; returns False when the file already had that content."""
+    path, record, seed, fmt, cached = job
+    if not cached:
+        # a one-off random seed would leave an entry nothing can hit again
+        rendered = render(record, seed, fmt)
+    else:
+        cache_key = render_key(record, seed, fmt)
+        hit = load_object(cache_key)
+        if hit is None:
+            rendered = render(record, seed, fmt)
+            store_object(cache_key, rendered)
+        else:
+            rendered = hit
+
+    with span("schedule.write_file"):
+        if os.path.exists(path):
+            with open(path, "rb") as fp:
+                if fp.read() == rendered:
+                    return False
+        with open(path, "wb") as fp:
+            fp.write(rendered)
+    return True
+
+
+def render_all(jobs: list[RenderJob], workers: int | None) -> list[bool]:
+    if workers == 1 or len(jobs) <= 1:
+        return list(map(render_puzzle, jobs))
+    # imported here: a single-date run should not pay for multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render_puzzle, jobs, chunksize=max(1, len(jobs) // 32)))
+
+
+def within_difficulty(
+    records: Iterable[tuple[str, dict[str, Any]]], low: float, high: float
+) -> list[tuple[str, dict[str, Any]]]:
+    # pandas is only imported by runs that ask for a difficulty
+    from codiac_sandbox.crud.difficulty import difficulty_scores
+
+    records = list(records)
+    scores = difficulty_scores(records)
+    return [
+        item for item, value in zip(records, scores.to_numpy()) if low <= value <= high
+    ]
+
+
+def draw_queued(k: int, seeded: bool = False) -> list[tuple[str, dict[str, Any]]]:
+    """Up to `k` unused puzzles from the per-type queues, in draw order."""
+    store = get_store()
+    queues = get_queues()
+    queues.sync(store, random.Random(store.source_digest) if seeded else None)
+    picked: list[tuple[str, dict[str, Any]]] = []
+    records: dict[str, dict[str, Any]] = {}
+
+    def live(id_: str) -> bool:
+        if id_ not in store:
+            return False
+        records[id_] = store.get(id_)
+        return not is_used(records[id_])
+
+    while len(picked) < k and (id_ := queues.draw(live)) is not None:
+        picked.append((id_, records[id_]))
+    return picked
+
+
+@traced()
+def schedule_range(
+    start: date,
+    days: int,
+    workers: int | None = None,
+    seeded: bool = False,
+    fmt: str = "legacy",
+    difficulty: tuple[float, float] | None = None,
+) -> dict[str, str]:
+    """
+    Fill every free date in the range with a distinct unused puzzle; returns
+    date -> puzzle ID. Picks come off the per-type queues, alternating types
+    by their configured weights. With `seeded`, rebuilt queues are shuffled
+    from the master list's digest, and each file depends only on its date
+    and puzzle ID. `difficulty` instead samples the puzzles scoring within
+    `(low, high)`, leaving the queues as they are.
+    """
+    dates = free_dates(start, days)
+    if not dates:
+        return {}
+
+    keys = [date_key(day) for day in dates]
+    if difficulty is None:
+        picked = draw_queued(len(keys), seeded)
+    else:
+        # scoring needs the whole pool anyway, so sample it directly
+        pool = within_difficulty(
+            ((id_, record) for id_, record in iter_records() if not is_used(record)),
+            *difficulty,
+        )
+        if seeded:
+            # log order shifts with every edit; ID order depends on the pool alone
+            pool.sort(key=lambda item: item[0])
+        picked = reservoir_sample(
+            pool,
+            len(keys),
+            random.Random(",".join(keys)) if seeded else None,
+        )
+    if len(picked) < len(keys):
+        print(
+            f"Only {len(picked)} unused puzzles left for {len(keys)} dates",
+            file=sys.stderr,
+        )
+        keys = keys[: len(picked)]
+
+    jobs: list[RenderJob] = [
+        (
+            os.path.join(OUTPUT_DIR, f"{key}.json"),
+            record,
+            puzzle_seed(key, id_) if seeded else random_seed(),
+            fmt,
+            seeded,
+        )
+        for key, (id_, record) in zip(keys, picked)
+    ]
+    render_all(jobs, workers)
+    assigned = {key: id_ for key, (id_, _) in zip(keys, picked)}
+    calendar = get_calendar()
+    manifest = get_manifest()
+    for (key, id_), (path, record, seed, _, _) in zip(assigned.items(), jobs):
+        calendar.assign(key, OUTPUT_DIR, id_, seeded)
+        manifest.record(path, id_, record, seed, fmt)
+    calendar.save()
+    manifest.save()
+
+    # one append for the whole batch, then a single rewrite of the master list
+    mark_used(list(assigned.values()))
+    compact()
+    if difficulty is None:
+        # the master list only moved by our own draws, which the queues are past
+        queues = get_queues()
+        queues.mark_synced(get_store())
+        queues.save()
+    return assigned
+
+
+@traced()
+def regenerate(
+    keys: Iterable[str] | None = None,
+    workers: int | None = None,
+    fmt: str | None = None,
+) -> dict[str, list[str]]:
+    """
+    Re-render the generated files whose puzzle, serializer, icon set or
+    format moved since the manifest recorded them, optionally only for the
+    date keys in `keys`. Returns file -> reasons for every file rewritten;
+    a stale file that renders to the same bytes is left untouched. Files
+    whose puzzle was deleted from the master list are reported and kept.
+    """
+    wanted = None if keys is None else set(keys)
+    manifest = get_manifest()
+    store = get_store()
+    stale: list[tuple[str, str, list[str]]] = []
+    jobs: list[RenderJob] = []
+    for name, entry in manifest.files.items():
+        key = os.path.basename(name).removesuffix(".json")
+        if wanted is not None and key not in wanted:
+            continue
+        if entry["id"] not in store:
+            # IDs persist in the master list, so only a deletion orphans a file
+            print(
+                f"{name}: puzzle {entry['id']} is no longer in the master list",
+                file=sys.stderr,
+            )
+            continue
+        record = store.get(entry["id"])
+        reasons = manifest.stale_reasons(name, record, fmt)
+        if reasons:
+            stale.append((name, entry["id"], reasons))
+            path = resource_path(*name.split("/"))
+            seeded = entry["seed"] == puzzle_seed(key, entry["id"])
+            jobs.append((path, record, entry["seed"], fmt or entry["format"], seeded))
+
+    rewritten: dict[str, list[str]] = {}
+    for (name, id_, reasons), job, written in zip(
+        stale, jobs, render_all(jobs, workers)
+    ):
+        path, record, seed, job_fmt, _ = job
+        manifest.record(path, id_, record, seed, job_fmt)
+        if written:
+            rewritten[name] = reasons
+    if jobs:
+        manifest.save()
+    return rewritten
+
+
+def regenerate_range(
+    start: date, days: int, workers: int | None = None, fmt: str | None = None
+) -> dict[str, list[str]]:
+    return regenerate(map(date_key, date_range(start, days)), workers, fmt)
@@ -0,0 +1,289 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import traceback
+from collections import OrderedDict
+from contextlib import suppress
+from datetime import datetime
+from typing import Callable, Hashable, NamedTuple
+
+from codiac_sandbox.crud.read import is_used, iter_records, reservoir_sample
+from codiac_sandbox.crud.store import get_store
+from codiac_sandbox.resources import resource_path
+from codiac_sandbox.selection.calendar import SCHEDULE_DIRS, get_calendar
+from codiac_sandbox.selection.render_cache import puzzle_seed
+from codiac_sandbox.selection.schedule import render
+from codiac_sandbox.utils.tracing import traced
+
+DEFAULT_CACHE_SIZE = 1024
+TUTORIAL_PATH = resource_path("tutorial.json")
+PUZZLE_PATH = re.compile(r"/puzzle/(\d{8})")
+# request line and headers; anything longer is refused
+MAX_HEADER_BYTES = 16 * 1024
+# request bodies are read and dropped; a longer one is refused
+MAX_BODY_BYTES = 64 * 1024
+# clients may reuse a response for a minute, then revalidate with its ETag
+CACHE_CONTROL = "public, max-age=60"
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes
+    etag: str | None = None
+
+
+def error(status: int) -> Response:
+    return Response(status, json.dumps(dict(error=REASONS[status])).encode())
+
+
+def etag_of(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def encode_response(response: Response, head_only: bool, keep_alive: bool) -> bytes:
+    lines = [f"HTTP/1.1 {response.status} {REASONS[response.status]}"]
+    if response.status != 304:
+        lines += [
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(response.body)}",
+        ]
+    if response.etag is not None:
+        lines += [f"ETag: {response.etag}", f"Cache-Control: {CACHE_CONTROL}"]
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode()
+    if head_only or response.status == 304:
+        return head
+    return head + response.body
+
+
+class LRUCache:
+    """Rendered responses, dropping the least recently used past `max_entries`."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Response] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Response | None:
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+        else:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return response
+
+    def put(self, key: Hashable, response: Response) -> None:
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def read_file(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+# the store and its snapshot are not shared across threads; misses are rare
+_generate_lock = threading.Lock()
+
+
+@traced()
+def generate_puzzle(key: str) -> bytes | None:
+    """
+    The frontend JSON for a date without a file: the puzzle the calendar
+    has for it, else a pick from the unused puzzles seeded by the date.
+    Rendered with parse_puzzle and the legacy serializer, which writes
+    exactly `json.dumps(puzzle.to_json(True), indent=2)`.
+    """
+    with _generate_lock:
+        store = get_store()
+        entries = get_calendar().entries(key).values()
+        ids = [entry["id"] for entry in entries if entry["id"] in store]
+        if ids:
+            id_, record = ids[0], store.get(ids[0])
+        else:
+            pool = ((i, r) for i, r in iter_records() if not is_used(r))
+            picked = reservoir_sample(pool, 1, random.Random(key))
+            if not picked:
+                return None
+            id_, record = picked[0]
+    return render(record, puzzle_seed(key, id_), "legacy")
+
+
+class PuzzleServer:
+    """
+    Serves `GET /puzzle/YYYYMMDD` and `GET /tutorial` over HTTP/1.1 with
+    keep-alive. Dated files come from resources/ (by-date before
+    auto-generated), other dates are generated on demand. Responses are
+    kept in an LRU keyed by file path, size and mtime, so edited files are
+    picked up, and answered with 304 when If-None-Match carries their ETag.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.cache = LRUCache(cache_size)
+        # one render per key, however many clients ask for it at once
+        self._pending: dict[Hashable, asyncio.Task[Response]] = {}
+
+    async def _cached(
+        self, key: Hashable, load: Callable[[str], bytes | None], arg: str
+    ) -> Response:
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(
+                self._load(key, load, arg)
+            )
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # a client hanging up must not cancel the render other clients wait on
+        return await asyncio.shield(task)
+
+    async def _load(
+        self, key: Hashable, load: Callable[[str], bytes | None], arg: str
+    ) -> Response:
+        body = await asyncio.to_thread(load, arg)
+        if body is None:
+            return error(404)
+        response = Response(200, body, etag_of(body))
+        self.cache.put(key, response)
+        return response
+
+    async def file_response(self, path: str) -> Response | None:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return await self._cached(
+            (path, stat.st_size, stat.st_mtime_ns), read_file, path
+        )
+
+    async def puzzle(self, key: str) -> Response:
+        try:
+            datetime.strptime(key, "%Y%m%d")
+        except ValueError:
+            return error(404)
+        for directory in SCHEDULE_DIRS:
+            response = await self.file_response(os.path.join(directory, f"{key}.json"))
+            if response is not None:
+                return response
+        return await self._cached(("generated", key), generate_puzzle, key)
+
+    async def respond(
+        self, method: str, target: str, headers: dict[str, str]
+    ) -> Response:
+        if method not in ("GET", "HEAD"):
+            return error(405)
+        path = target.split("?", 1)[0]
+        if path == "/tutorial":
+            response = await self.file_response(TUTORIAL_PATH) or error(404)
+        elif match := PUZZLE_PATH.fullmatch(path):
+            response = await self.puzzle(match[1])
+        else:
+            response = error(404)
+        if response.etag is not None and etag_matches(
+            headers.get("if-none-match", ""), response.etag
+        ):
+            return Response(304, b"", response.etag)
+        return response
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(encode_response(error(400), False, False))
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                parts = request_line.split()
+                if len(parts) != 3:
+                    writer.write(encode_response(error(400), False, False))
+                    break
+                method, target, version = parts
+
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.1":
+                    keep_alive = connection != "close"
+                else:
+                    keep_alive = connection == "keep-alive"
+                length = headers.get("content-length") or "0"
+                if not (length.isascii() and length.isdigit()) or (
+                    int(length) > MAX_BODY_BYTES
+                ):
+                    writer.write(encode_response(error(400), False, False))
+                    break
+                if int(length):
+                    await reader.readexactly(int(length))
+
+                try:
+                    response = await self.respond(method, target, headers)
+                except Exception:
+                    # a failed render still answers every client waiting on it
+                    traceback.print_exc()
+                    response = error(500)
+                writer.write(encode_response(response, method == "HEAD", keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+async def serve(
+    host: str = "127.0.0.1", port: int = 8000, cache_size: int = DEFAULT_CACHE_SIZE
+) -> None:
+    # created here, not lazily from the worker threads that render misses
+    get_store()
+    get_calendar()
+    server = PuzzleServer(cache_size)
+    listener = await asyncio.start_server(
+        server.handle, host, port, limit=MAX_HEADER_BYTES, backlog=4096
+    )
+    print(f"serving on http://{host}:{port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
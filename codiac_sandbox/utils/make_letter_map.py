@@ -1,16 +1,22 @@
-from random import choices, sample
+import random
 
-import json
+from codiac_sandbox.resources import load_resource
+from codiac_sandbox.utils.tracing import traced
 
-with open("resources/icon-list.json", "r") as file:
-    icons: list[str] = json.load(file)
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
 
 
-def get_new_letter_map(quote: str) -> dict[str, str]:
+def get_icons() -> list[str]:
+    return load_resource("icon-list.json")
+
+
+@traced()
+def get_new_letter_map(quote: str, rng: random.Random | None = None) -> dict[str, str]:
+    # sorted so a seeded rng gives the same map regardless of hash randomization
     return {
         char: icon
         for char, icon in zip(
-            set(quote.lower()).intersection("qwertyuiopasdfghjklzxcvbnm"),
-            sample(icons, 26),
+            sorted(set(quote.lower()).intersection("qwertyuiopasdfghjklzxcvbnm")),
+            (rng or random).sample(get_icons(), 26),
         )
     }
@@ -1,7 +1,19 @@
-from typing import Any, TypeVar
+import inspect
+import re
+import types
+import typing
+from functools import cache
+from typing import Any, Callable, NamedTuple, TypeVar, get_args, get_origin
+
 from codiac_sandbox.puzzle_types import (
     CryptographBase,
 )
+from codiac_sandbox.utils.tracing import traced
+
+# base-class arguments subclasses fill in themselves; never asked for
+_DERIVED = {"self", "string_to_encrypt", "puzzle_type", "hints"}
+
+TRUE_VALUES = {"true", "yes", "y", "1"}
 
 
 def get_all_subclasses(cls: type[CryptographBase]) -> set[type[CryptographBase]]:
@@ -23,6 +35,117 @@ PUZZLE_CLASSES: dict[str, type[CryptographBase]] = dict(
     )
 )
 
+
+def allows_none(annotation: Any) -> bool:
+    origin = get_origin(annotation)
+    if origin is types.UnionType or origin is typing.Union:
+        return type(None) in get_args(annotation)
+    return False
+
+
+class Field(NamedTuple):
+    """One constructor argument; `annotation` and `default` mirror inspect.Parameter."""
+
+    name: str
+    annotation: Any
+    default: Any
+    # where from_json reads it: a record key, or a function of the record
+    json_key: str | Callable[[dict[str, Any]], Any]
+
+    @property
+    def required(self) -> bool:
+        return self.default is inspect.Parameter.empty
+
+    @property
+    def optional(self) -> bool:
+        """Optional fields may be None, and stay off the add-puzzle form."""
+        return allows_none(self.annotation)
+
+    def from_text(self, text: str) -> Any:
+        """The argument for a form or spreadsheet cell holding `text`."""
+        if self.annotation is bool:
+            return text.strip().lower() in TRUE_VALUES
+        if self.annotation == list[str]:
+            return [item for item in re.split(r"[\s,;]+", text) if item]
+        return text
+
+
+class PuzzleSchema(NamedTuple):
+    cls: type[CryptographBase]
+    # every constructor argument, in signature order
+    fields: dict[str, Field]
+    # the subset the add-puzzle dialog asks for
+    form_fields: dict[str, Field]
+    # attributes stored by to_json and shown as other_info, in that order
+    attributes: tuple[str, ...]
+    # record -> instance, generated for the class
+    parse: Callable[[dict[str, Any]], CryptographBase]
+
+    def missing(self, values: dict[str, Any]) -> list[str]:
+        """Required fields that `values` leaves absent or blank."""
+        return [
+            name
+            for name, field in self.fields.items()
+            if field.required and values.get(name) in (None, "", [])
+        ]
+
+
+def _parser_source(fields: dict[str, Field]) -> str:
+    args = []
+    for name, field in fields.items():
+        if callable(field.json_key):
+            args.append(f"readers[{name!r}](data)")
+        elif field.required:
+            args.append(f"data[{field.json_key!r}]")
+        else:
+            args.append(f"data.get({field.json_key!r}, defaults[{name!r}])")
+    return "def parse(data):\n    return cls(" + ", ".join(args) + ")\n"
+
+
+def compile_parser(
+    cls: type[CryptographBase], fields: dict[str, Field]
+) -> Callable[[dict[str, Any]], CryptographBase]:
+    """Generate a straight-line from_json for one class: one lookup per argument."""
+    namespace = dict(
+        cls=cls,
+        readers={n: f.json_key for n, f in fields.items() if callable(f.json_key)},
+        defaults={n: f.default for n, f in fields.items() if not f.required},
+    )
+    exec(compile(_parser_source(fields), f"<parser {cls.__name__}>", "exec"), namespace)
+    return namespace["parse"]  # type: ignore[return-value]
+
+
+def build_schema(cls: type[CryptographBase]) -> PuzzleSchema:
+    fields = {
+        name: Field(
+            name,
+            param.annotation,
+            param.default,
+            cls.JSON_KEYS.get(name, name),
+        )
+        for name, param in inspect.signature(cls.__init__).parameters.items()
+        if name not in _DERIVED
+    }
+    return PuzzleSchema(
+        cls,
+        fields,
+        {name: f for name, f in fields.items() if not f.optional},
+        cls.field_names(),
+        compile_parser(cls, fields),
+    )
+
+
+@cache
+def get_schema(cls: type[CryptographBase]) -> PuzzleSchema:
+    """The schema of any puzzle class, including ones defined after import."""
+    return build_schema(cls)
+
+
+SCHEMAS: dict[str, PuzzleSchema] = {
+    name: get_schema(cls) for name, cls in PUZZLE_CLASSES.items()
+}
+
+
 T = TypeVar("T", bound=CryptographBase)
 
 
@@ -30,6 +153,6 @@ def from_json(cls: type[T], data: dict[str, Any]) -> T:
     return cls.from_json(data)
 
 
+@traced()
 def parse_puzzle(data: dict[str, Any]) -> CryptographBase:
-    cls = PUZZLE_CLASSES[data["type"]]
-    return cls.from_json(data)
+    return SCHEMAS[data["type"]].parse(data)
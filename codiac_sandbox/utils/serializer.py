@@ -0,0 +1,144 @@
+from json.encoder import encode_basestring_ascii as encode
+from typing import Callable
+
+from codiac_sandbox.hint_types import GiveALetterHint
+from codiac_sandbox.puzzle_types import CryptographBase
+from codiac_sandbox.utils.puzzle_classes import get_schema
+
+# bump whenever the rendered bytes of any format change
+SERIALIZER_VERSION = 1
+
+Serializer = Callable[[CryptographBase], str]
+
+# attributes every puzzle has that never land in other_info
+_BASE_FIELDS = {"puzzle_type", "string_to_encrypt", "used", "encryption_map", "hints"}
+
+# named output formats, as serialize_frontend keyword arguments
+FORMATS: dict[str, dict[str, bool]] = {
+    "legacy": dict(legacy=True),
+    "json": {},
+    "json-compact": dict(compact=True),
+}
+
+_serializers: dict[tuple[type[CryptographBase], bool, bool], Serializer] = {}
+
+
+def info_fields(cls: type[CryptographBase]) -> tuple[str, ...]:
+    return tuple(k for k in get_schema(cls).attributes if k not in _BASE_FIELDS)
+
+
+def _layout(compact: bool) -> tuple[str, str, str, str]:
+    """Newline+indent at depths 1, 2 and 3, and the key separator, like json.dumps."""
+    if compact:
+        return "", "", "", ":"
+    return "\n  ", "\n    ", "\n      ", ": "
+
+
+def _source(fields: tuple[str, ...], legacy: bool, compact: bool) -> str:
+    nl1, nl2, nl3, colon = _layout(compact)
+    close = "\n" if not compact else ""
+
+    def key(name: str) -> str:
+        return encode(name) + colon
+
+    def container(open_: str, close_: str, items: str) -> str:
+        # json.dumps writes empty containers as [] / {} without newlines
+        return (
+            f"(({open_ + nl2!r} + {',' + nl2!r}.join({items}) + {nl1 + close_!r}) "
+            f"if {items} else {open_ + close_!r})"
+        )
+
+    lines = [
+        "def serialize(puzzle):",
+        "    encryption_map = puzzle.encryption_map",
+        "    letters = list(dict.fromkeys(",
+        "        hint.letter for hint in puzzle.hints if isinstance(hint, GiveALetterHint)",
+        "    ))",
+        "    info = []",
+    ]
+    for field in fields:
+        title = field.replace("_", " ").title()
+        lines += [
+            f"    value = puzzle.{field}",
+            "    if value is not None:",
+            (
+                f"        info.append({repr(title) + ': '!r} + repr(str(value)))"
+                if legacy
+                else f"        info.append({key(title)!r} + encode(str(value)))"
+            ),
+        ]
+
+    if legacy:
+        # the historical format: every value is the str() of a Python object
+        hints = (
+            "encode('[' + ', '.join("
+            "\"{'letter': \" + repr(letter) + \", 'type': 'GiveALetterHint'}\" "
+            "for letter in letters) + ']')"
+        )
+        mapping = (
+            "encode('{' + ', '.join(repr(k) + ': ' + repr(v) "
+            "for k, v in encryption_map.items()) + '}')"
+        )
+        other = "encode('{' + ', '.join(info) + '}')"
+    else:
+        lines += [
+            "    hint_items = [",
+            f"        '{{' + {nl3!r} + {key('letter')!r} + encode(letter) + ',' + {nl3!r}"
+            f" + {key('type') + encode('GiveALetterHint')!r} + {nl2!r} + '}}'",
+            "        for letter in letters",
+            "    ]",
+            f"    map_items = [encode(k) + {colon!r} + encode(v) for k, v in encryption_map.items()]",
+        ]
+        hints = container("[", "]", "hint_items")
+        mapping = container("{", "}", "map_items")
+        other = container("{", "}", "info")
+
+    lines += [
+        "    return (",
+        f"        '{{' + {nl1 + key('puzzle_type')!r} + encode(puzzle.puzzle_type)",
+        f"        + ',' + {nl1 + key('string_to_encrypt')!r} + encode(puzzle.string_to_encrypt.lower())",
+        f"        + ',' + {nl1 + key('hints')!r} + {hints}",
+        f"        + ',' + {nl1 + key('encryption_map')!r} + {mapping}",
+        f"        + ',' + {nl1 + key('other_info')!r} + {other}",
+        f"        + {close!r} + '}}'",
+        "    )",
+    ]
+    return "\n".join(lines)
+
+
+def compile_serializer(
+    cls: type[CryptographBase],
+    fields: tuple[str, ...],
+    legacy: bool = False,
+    compact: bool = False,
+) -> Serializer:
+    """Generate straight-line code writing the frontend JSON for one puzzle class."""
+    namespace = dict(encode=encode, GiveALetterHint=GiveALetterHint)
+    exec(
+        compile(
+            _source(fields, legacy, compact), f"<serializer {cls.__name__}>", "exec"
+        ),
+        namespace,
+    )
+    return namespace["serialize"]  # type: ignore[return-value]
+
+
+def serialize_frontend(
+    puzzle: CryptographBase, compact: bool = False, legacy: bool = False
+) -> str:
+    """
+    Frontend JSON for `puzzle`, without building an intermediate dict.
+
+    By default hints, encryption_map and other_info are real JSON arrays and
+    objects. `legacy` reproduces `json.dumps(puzzle.to_json(True), indent=2)`
+    byte for byte, with those values as Python repr strings, and `compact`
+    drops the indentation.
+    """
+    key = (type(puzzle), legacy, compact)
+    serializer = _serializers.get(key)
+    if serializer is None:
+        # every instance of a class has the same slots, in the same order
+        serializer = _serializers[key] = compile_serializer(
+            type(puzzle), info_fields(type(puzzle)), legacy, compact
+        )
+    return serializer(puzzle)
@@ -0,0 +1,285 @@
+import os
+import re
+from itertools import combinations
+from typing import Any, Iterable, NamedTuple
+
+from codiac_sandbox.utils.tracing import traced
+
+WORD = re.compile(r"[a-z]+(?:'[a-z]+)*")
+
+# enumeration stops here; anything past one solution already means "ambiguous"
+MAX_SOLUTIONS = 64
+# hint sets up to this size are searched exhaustively, larger ones greedily
+EXACT_HINT_SEARCH = 5
+
+
+def words_of(text: str) -> list[str]:
+    return WORD.findall(text.lower())
+
+
+def word_pattern(word: str) -> str:
+    """The word's letter shape: "that" and "high" are both "0.1.2.0"."""
+    first: dict[str, int] = {}
+    return ".".join(
+        char if char == "'" else str(first.setdefault(char, len(first)))
+        for char in word
+    )
+
+
+class PatternIndex:
+    """Words grouped by letter shape, the only thing a cryptogram reveals."""
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        self.patterns: dict[str, list[str]] = {}
+        self._words: set[str] = set()
+        # words read from wordlist files; None when the index was given none
+        self.listed: set[str] | None = None
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def add(self, word: str) -> None:
+        if word not in self._words:
+            self._words.add(word)
+            self.patterns.setdefault(word_pattern(word), []).append(word)
+
+    def candidates(self, word: str) -> list[str]:
+        return self.patterns.get(word_pattern(word), [])
+
+    @classmethod
+    def from_texts(
+        cls, texts: Iterable[str], wordlists: Iterable[str] = ()
+    ) -> "PatternIndex":
+        """Index every word of `texts`, plus one-word-per-line wordlist files."""
+        index = cls()
+        for text in texts:
+            for word in words_of(text):
+                index.add(word)
+        for path in wordlists:
+            if index.listed is None:
+                index.listed = set()
+            if os.path.exists(path):
+                with open(path) as f:
+                    for line in f:
+                        for word in words_of(line):
+                            index.add(word)
+                            index.listed.add(word)
+        return index
+
+
+class SolveReport(NamedTuple):
+    # distinct readings found, capped at MAX_SOLUTIONS
+    solutions: int
+    # fewest revealed letters that leave only the intended reading
+    min_hints: int
+    # words missing from the wordlists; always empty when none were given, since
+    # the index holds every puzzle's own words
+    unknown_words: list[str]
+
+    @property
+    def unique(self) -> bool:
+        return self.solutions == 1
+
+
+class Solver:
+    """
+    Enumerates the readings of a cryptogram that use only indexed words.
+
+    Cipher symbols are labelled by the letter they hide, so the intended
+    reading maps every letter to itself; words missing from the index are
+    left unconstrained, so the intended reading is always a solution. The
+    search fills in the word with the fewest consistent candidates first,
+    prunes as soon as any word has none left, and remembers dead partial
+    assignments so a branch reached twice is only explored once.
+    """
+
+    def __init__(self, index: PatternIndex, max_solutions: int = MAX_SOLUTIONS):
+        self.index = index
+        self.max_solutions = max_solutions
+
+    def solve(
+        self, text: str, fixed: dict[str, str] | None = None
+    ) -> list[dict[str, str]]:
+        words: list[tuple[str, ...]] = []
+        candidates: list[list[tuple[str, ...]]] = []
+        for word in dict.fromkeys(words_of(text)):
+            if word in self.index:
+                words.append(tuple(c for c in word if c != "'"))
+                candidates.append(
+                    [
+                        tuple(c for c in option if c != "'")
+                        for option in self.index.candidates(word)
+                    ]
+                )
+
+        # per word, a bitmask of the letters its candidates put on each symbol
+        slot_letters: list[tuple[tuple[str, int], ...]] = []
+        for symbols, options in zip(words, candidates):
+            slots = dict.fromkeys(symbols, 0)
+            for option in options:
+                for symbol, letter in zip(symbols, option):
+                    slots[symbol] |= letter_bit(letter)
+            slot_letters.append(tuple(slots.items()))
+
+        assignment = dict(fixed or {})
+        used = set(assignment.values())
+        solutions: list[dict[str, str]] = []
+        dead: set[tuple] = set()
+
+        def fits(symbols: tuple[str, ...], option: tuple[str, ...]) -> bool:
+            for symbol, letter in zip(symbols, option):
+                current = assignment.get(symbol)
+                if current is None:
+                    if letter in used:
+                        return False
+                elif current != letter:
+                    return False
+            return True
+
+        def search(remaining: frozenset[int]) -> None:
+            if not remaining:
+                solutions.append(dict(assignment))
+                return
+            # the rest of the search only sees how the remaining words' symbols
+            # are assigned, and which letters their open symbols can no longer take
+            assigned = []
+            wanted = 0
+            for i in remaining:
+                for symbol, slot in slot_letters[i]:
+                    if symbol in assignment:
+                        assigned.append((symbol, assignment[symbol]))
+                    else:
+                        wanted |= slot
+            taken = frozenset(c for c in used if letter_bit(c) & wanted)
+            key = (remaining, frozenset(assigned), taken)
+            if key in dead:
+                return
+
+            best = -1
+            best_options: list[tuple[str, ...]] = []
+            for i in remaining:
+                options = [o for o in candidates[i] if fits(words[i], o)]
+                if not options:
+                    dead.add(key)
+                    return
+                if best < 0 or len(options) < len(best_options):
+                    best, best_options = i, options
+                    if len(options) == 1:
+                        break
+
+            found = len(solutions)
+            for option in best_options:
+                added = []
+                for symbol, letter in zip(words[best], option):
+                    if symbol not in assignment:
+                        assignment[symbol] = letter
+                        used.add(letter)
+                        added.append(symbol)
+                search(remaining - {best})
+                for symbol in added:
+                    used.discard(assignment.pop(symbol))
+                if len(solutions) >= self.max_solutions:
+                    return
+            if len(solutions) == found:
+                dead.add(key)
+
+        search(frozenset(range(len(words))))
+        return solutions
+
+    def report(self, text: str) -> SolveReport:
+        listed = self.index.listed
+        unknown = (
+            []
+            if listed is None
+            else [word for word in dict.fromkeys(words_of(text)) if word not in listed]
+        )
+        solutions = self.solve(text)
+
+        # every wrong reading must be contradicted by at least one revealed letter
+        conflicts = [wrong_letters(s) for s in solutions if not is_intended(s)]
+        hints: set[str] = set()
+        while conflicts:
+            hints = min_hitting_set(conflicts)
+            # readings past the enumeration cap may survive these hints
+            left = [
+                wrong_letters(s)
+                for s in self.solve(text, {letter: letter for letter in hints})
+                if not is_intended(s)
+            ]
+            if not left:
+                break
+            conflicts += left
+        return SolveReport(len(solutions), len(hints), unknown)
+
+
+def letter_bit(letter: str) -> int:
+    return 1 << (ord(letter) - ord("a"))
+
+
+def is_intended(solution: dict[str, str]) -> bool:
+    return all(symbol == letter for symbol, letter in solution.items())
+
+
+def wrong_letters(solution: dict[str, str]) -> frozenset[str]:
+    return frozenset(s for s, letter in solution.items() if s != letter)
+
+
+def min_hitting_set(sets: list[frozenset[str]]) -> set[str]:
+    """A smallest set of letters meeting every set, exact up to EXACT_HINT_SEARCH."""
+    letters = sorted(set().union(*sets))
+    bit = {letter: 1 << i for i, letter in enumerate(letters)}
+    masks = {sum(bit[letter] for letter in s) for s in sets}
+    for size in range(EXACT_HINT_SEARCH + 1):
+        for combo in combinations(letters, size):
+            chosen = sum(bit[letter] for letter in combo)
+            if all(mask & chosen for mask in masks):
+                return set(combo)
+
+    chosen_letters: set[str] = set()
+    unmet = list(masks)
+    while unmet:
+        letter = max(letters, key=lambda l: sum(1 for m in unmet if m & bit[l]))
+        chosen_letters.add(letter)
+        unmet = [m for m in unmet if not m & bit[letter]]
+    return chosen_letters
+
+
+_worker_solver: Solver | None = None
+
+
+def _init_worker(index: PatternIndex) -> None:
+    global _worker_solver
+    _worker_solver = Solver(index)
+
+
+def _report(text: str) -> SolveReport:
+    assert _worker_solver is not None
+    return _worker_solver.report(text)
+
+
+@traced()
+def validate_records(
+    records: Iterable[tuple[str, dict[str, Any]]],
+    wordlists: Iterable[str] = (),
+    workers: int | None = None,
+) -> dict[str, SolveReport]:
+    """Solve every record against an index of all their words plus `wordlists`."""
+    records = list(records)
+    texts = [str(record["string_to_encrypt"]) for _, record in records]
+    index = PatternIndex.from_texts(texts, wordlists)
+    if workers == 1 or len(texts) <= 1:
+        _init_worker(index)
+        reports = list(map(_report, texts))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(index,)
+        ) as pool:
+            reports = list(pool.map(_report, texts, chunksize=max(1, len(texts) // 64)))
+    return {puzzle_id: report for (puzzle_id, _), report in zip(records, reports)}
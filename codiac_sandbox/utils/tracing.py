@@ -0,0 +1,145 @@
+import atexit
+import functools
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Iterator, TypeVar
+
+# CODIAC_TRACE=1 writes trace.json, any other value is used as the trace path
+TRACE_ENV = "CODIAC_TRACE"
+PARENT_ENV = "CODIAC_TRACE_PARENT"
+DEFAULT_TRACE_PATH = "trace.json"
+
+ENABLED = os.environ.get(TRACE_ENV, "") not in ("", "0")
+TRACE_PATH = (
+    DEFAULT_TRACE_PATH
+    if os.environ.get(TRACE_ENV) == "1"
+    else os.environ.get(TRACE_ENV, "")
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# (name, start in µs, duration in µs, pid, thread id)
+_events: list[tuple[str, float, float, int, int]] = []
+
+
+@contextmanager
+def _span(name: str) -> Iterator[None]:
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        _events.append(
+            (
+                name,
+                start / 1000,
+                (end - start) / 1000,
+                os.getpid(),
+                threading.get_ident(),
+            )
+        )
+
+
+def span(name: str) -> ContextManager[None]:
+    """Time a block as `name`; a shared no-op when tracing is off."""
+    return _span(name) if ENABLED else nullcontext()
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Record a span per call. When tracing is off the function is returned untouched."""
+
+    def decorate(func: F) -> F:
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _span(label):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def summary(events: list[tuple[str, float, float, int, int]]) -> str:
+    stats: dict[str, list[float]] = {}
+    for name, _, duration, _, _ in events:
+        entry = stats.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] = max(entry[2], duration)
+
+    lines = [
+        f"{'span':<40} {'calls':>9} {'total ms':>11} {'mean µs':>10} {'max ms':>9}"
+    ]
+    for name, (calls, total, longest) in sorted(stats.items(), key=lambda s: -s[1][1]):
+        lines.append(
+            f"{name:<40} {calls:>9,.0f} {total / 1000:>11.2f} "
+            f"{total / calls:>10.1f} {longest / 1000:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def _part_path(pid: int) -> str:
+    return f"{TRACE_PATH}.{pid}.part"
+
+
+def _write_part() -> None:
+    # pool workers leave through os._exit, so they hand their spans to the parent
+    with open(_part_path(os.getpid()), "w") as f:
+        json.dump(_events, f)
+
+
+def _write_trace() -> None:
+    events = list(_events)
+    for part in glob.glob(f"{TRACE_PATH}.*.part"):
+        with open(part) as f:
+            events.extend(tuple(event) for event in json.load(f))  # type: ignore[misc]
+        os.remove(part)
+
+    with open(TRACE_PATH, "w") as f:
+        json.dump(
+            dict(
+                traceEvents=[
+                    dict(name=name, ph="X", ts=start, dur=duration, pid=pid, tid=tid)
+                    for name, start, duration, pid, tid in events
+                ],
+                displayTimeUnit="ms",
+            ),
+            f,
+        )
+    print(summary(events), file=sys.stderr)
+    print(f"trace written to {TRACE_PATH}", file=sys.stderr)
+
+
+def _register_child(*_: Any) -> None:
+    from multiprocessing import util
+
+    _events.clear()
+    util.Finalize(None, _write_part, exitpriority=100)
+
+
+class _AfterFork:
+    pass
+
+
+_after_fork = _AfterFork()  # register_after_fork needs a weakref-able key
+
+if ENABLED:
+    if os.environ.get(PARENT_ENV, str(os.getpid())) == str(os.getpid()):
+        os.environ[PARENT_ENV] = str(os.getpid())
+        atexit.register(_write_trace)
+        # multiprocessing is slow to import, so only tracing runs pay for it
+        from multiprocessing import util
+
+        util.register_after_fork(_after_fork, _register_child)
+    else:
+        # spawned (not forked) worker importing this module afresh
+        _register_child()
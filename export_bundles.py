@@ -0,0 +1,27 @@
+from argparse import ArgumentParser
+
+from codiac_sandbox.selection.export import EXPORT_DIR, brotli_module, export_bundles
+
+parser = ArgumentParser(
+    description="Bundle every scheduled puzzle into precompressed month shards for the frontend"
+)
+parser.add_argument(
+    "--output",
+    default=EXPORT_DIR,
+    help="where the shards and manifest.json go (default: resources/bundles)",
+)
+parser.add_argument(
+    "--require-brotli",
+    action="store_true",
+    help="fail instead of writing gzip variants only when brotli is not installed",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    if brotli_module() is None:
+        if args.require_brotli:
+            parser.error("brotli is not installed")
+        print("brotli is not installed; writing gzip variants only")
+    changed = export_bundles(args.output)
+    for month, rewritten in changed.items():
+        print(f"{month}: {'written' if rewritten else 'unchanged'}")
@@ -0,0 +1,24 @@
+from argparse import ArgumentParser
+
+from codiac_sandbox.crud.duplicates import MASTER_LIST, find_duplicate_clusters
+
+parser = ArgumentParser(description="Cluster near-duplicate puzzles in the master list")
+parser.add_argument(
+    "paths",
+    nargs="*",
+    default=[MASTER_LIST],
+    help="puzzle lists to scan together, e.g. resources/old-puzzle-list.json as well "
+    "(default: the master list)",
+)
+parser.add_argument(
+    "--threshold", type=float, default=0.6, help="minimum estimated Jaccard similarity"
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    clusters = find_duplicate_clusters(args.paths, args.threshold)
+    for cluster in clusters:
+        print()
+        for location, text in cluster:
+            print(f"{location}: {text[:80]}")
+    print(f"\n{len(clusters)} clusters")
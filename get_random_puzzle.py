@@ -1,15 +1,82 @@
+from argparse import ArgumentParser, ArgumentTypeError
 from datetime import datetime, timedelta
-import json
-from random import choice
-from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES, parse_puzzle
 
-tomorrow = datetime.now() + timedelta(days=1)
+from codiac_sandbox.selection.schedule import (
+    regenerate,
+    regenerate_range,
+    schedule_range,
+)
+from codiac_sandbox.utils.serializer import FORMATS
 
-with open("resources/master-puzzle-list.json", "r") as read:
-    with open(
-        f"resources/auto-generated/{tomorrow.strftime('%Y%m%d')}.json", "w"
-    ) as write:
-        puzzle = parse_puzzle(choice(json.load(read)))
-        data = puzzle.to_json(to_read_from_frontend=True)
 
-        json.dump(data, write, indent=2)
+def difficulty_range(text: str) -> tuple[float, float]:
+    try:
+        low, high = (float(bound) for bound in text.split(":"))
+    except ValueError:
+        raise ArgumentTypeError(f"expected LOW:HIGH, e.g. 2:6.5, not {text!r}")
+    if low > high:
+        raise ArgumentTypeError(f"LOW must not exceed HIGH in {text!r}")
+    return low, high
+
+
+parser = ArgumentParser(description="Schedule puzzles into resources/auto-generated")
+parser.add_argument(
+    "--start",
+    type=lambda s: datetime.strptime(s, "%Y%m%d").date(),
+    default=(datetime.now() + timedelta(days=1)).date(),
+    help="first date to fill, as YYYYMMDD (default: tomorrow)",
+)
+parser.add_argument("--days", type=int, default=1, help="number of days to fill")
+parser.add_argument("--workers", type=int, default=None, help="process pool size")
+parser.add_argument(
+    "--seeded",
+    action="store_true",
+    help="derive picks, icon maps and hint orders from the date and puzzle ID",
+)
+parser.add_argument(
+    "--regenerate",
+    action="store_true",
+    help="re-render files in the range whose puzzle, serializer or seed changed since they were written",
+)
+parser.add_argument(
+    "--all",
+    action="store_true",
+    help="with --regenerate, check every file in the manifest instead of the date range",
+)
+parser.add_argument(
+    "--difficulty",
+    type=difficulty_range,
+    default=None,
+    help="only pick puzzles scoring LOW:HIGH on the 0-10 difficulty scale",
+)
+parser.add_argument(
+    "--format",
+    choices=list(FORMATS),
+    default=None,
+    help="legacy (the default) keeps hints/encryption_map/other_info as Python repr strings; "
+    "--regenerate keeps each file's own format unless given",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    if args.regenerate:
+        if args.all:
+            rewritten = regenerate(workers=args.workers, fmt=args.format)
+        else:
+            rewritten = regenerate_range(
+                args.start, args.days, args.workers, args.format
+            )
+        for name, reasons in rewritten.items():
+            print(f"{name}: rewritten ({', '.join(reasons)})")
+        print(f"{len(rewritten)} files rewritten")
+    else:
+        scheduled = schedule_range(
+            args.start,
+            args.days,
+            args.workers,
+            args.seeded,
+            args.format or "legacy",
+            args.difficulty,
+        )
+        for key, puzzle_id in scheduled.items():
+            print(f"{key}: {puzzle_id}")
@@ -0,0 +1,40 @@
+from argparse import ArgumentParser
+import json
+
+from codiac_sandbox.crud.bulk_import import import_rows, read_rows
+
+parser = ArgumentParser(
+    description="Import puzzle submissions from CSV or JSON-lines form exports"
+)
+parser.add_argument(
+    "paths",
+    nargs="+",
+    help="CSV files with a header row (a type column plus the puzzle's fields) or .jsonl files",
+)
+parser.add_argument("--workers", type=int, default=None, help="process pool size")
+parser.add_argument(
+    "--dry-run", action="store_true", help="validate the rows without storing anything"
+)
+parser.add_argument(
+    "--rejects",
+    default=None,
+    help="write rejected rows here, as JSON lines with the reason",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    rows = [row for path in args.paths for row in read_rows(path)]
+    ids, rejected = import_rows(rows, args.workers, args.dry_run)
+
+    for source, reason, _ in rejected:
+        print(f"{source}: {reason}")
+    if args.rejects:
+        with open(args.rejects, "w") as f:
+            for source, reason, row in rejected:
+                f.write(json.dumps(dict(source=source, reason=reason, row=row)) + "\n")
+
+    accepted = len(rows) - len(rejected)
+    print()
+    print(f"{len(rows):>7,} rows read")
+    print(f"{accepted:>7,} rows {'valid' if args.dry_run else 'imported'}")
+    print(f"{len(rejected):>7,} rows rejected")
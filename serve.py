@@ -0,0 +1,23 @@
+from argparse import ArgumentParser
+import asyncio
+
+from codiac_sandbox.server import DEFAULT_CACHE_SIZE, serve
+
+parser = ArgumentParser(
+    description="Serve /puzzle/YYYYMMDD and /tutorial from resources/ over HTTP"
+)
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8000)
+parser.add_argument(
+    "--cache-size",
+    type=int,
+    default=DEFAULT_CACHE_SIZE,
+    help="rendered responses kept in memory",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.cache_size))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,58 @@
+import pytest
+
+from codiac_sandbox.puzzle_types import (
+    CharacterQuote,
+    CryptographBase,
+    DirectQuote,
+    FamousDocumentQuote,
+    GeneralPhrase,
+    ListPuzzle,
+    Riddle,
+    RiddleSolvedInReverse,
+    SongLyrics,
+)
+from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES, parse_puzzle
+
+PUZZLES = [
+    ListPuzzle("Name the planets", ["Mercury", "Venus", "Earth"]),
+    CharacterQuote(
+        "I'll be back.", "Movie", "The Terminator", "The Terminator", "1984"
+    ),
+    FamousDocumentQuote("We the People", "Constitution", "Madison", "1787"),
+    DirectQuote("Dated", "Someone", "2001"),
+    GeneralPhrase("A stitch in time saves nine"),
+    SongLyrics("Let it be", "The Beatles", "Let It Be", "1970", used=True),
+    Riddle("What has keys but can't open locks?", "A piano"),
+    RiddleSolvedInReverse("What runs but never walks?", "A river"),
+]
+IDS = [type(p).__name__ for p in PUZZLES]
+
+
+def test_every_class_is_covered():
+    assert set(IDS) == set(PUZZLE_CLASSES)
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES, ids=IDS)
+def test_parse_puzzle_round_trips_to_json(puzzle):
+    record = puzzle.to_json()
+    parsed = parse_puzzle(record)
+    assert type(parsed) is type(puzzle)
+    assert parsed.to_json() == record
+
+
+def test_parse_puzzle_applies_defaults():
+    parsed = parse_puzzle(
+        dict(type="DirectQuote", string_to_encrypt="No date", author="Anon")
+    )
+    assert parsed.date is None
+    assert parsed.used is False
+
+
+def test_parse_puzzle_requires_fields():
+    with pytest.raises(KeyError):
+        parse_puzzle(dict(type="DirectQuote", string_to_encrypt="No author"))
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        CryptographBase("typeless")  # type: ignore[abstract]
@@ -0,0 +1,161 @@
+import json
+import random
+from itertools import groupby
+
+import pytest
+
+import codiac_sandbox.crud.read as read
+import codiac_sandbox.crud.snapshot as snapshot
+import codiac_sandbox.crud.store as store_module
+from codiac_sandbox.crud.store import PuzzleStore
+from codiac_sandbox.selection.queues import PuzzleQueues
+
+
+def ids(prefix: str, count: int) -> list[str]:
+    return [f"{prefix}{i:011d}" for i in range(count)]
+
+
+def make_queues(directory, stock: dict[str, int], **weights: float) -> PuzzleQueues:
+    queues = PuzzleQueues(str(directory))
+    queues.weights = weights
+    for type_, count in stock.items():
+        queues.queue(type_).rewrite(ids(type_[0].lower(), count))
+    return queues
+
+
+def draw_all(queues: PuzzleQueues, live=lambda _: True) -> list[str]:
+    drawn = []
+    while (id_ := queues.draw(live)) is not None:
+        drawn.append(id_)
+    return drawn
+
+
+def test_weighted_round_robin_follows_the_weights(tmp_path):
+    queues = make_queues(tmp_path, {"Riddle": 30, "SongLyrics": 30}, Riddle=2.0)
+    queues.max_run = None
+    first = [id_[0] for id_ in draw_all(queues)[:30]]
+    assert first.count("r") == 20
+    assert first.count("s") == 10
+    # smooth: the lighter type is spread out, not drawn in a block
+    assert max(len(list(run)) for _, run in groupby(first)) == 2
+
+
+def test_max_run_alternates_types_while_both_have_stock(tmp_path):
+    queues = make_queues(tmp_path, {"Riddle": 10, "SongLyrics": 10}, Riddle=5.0)
+    drawn = [id_[0] for id_ in draw_all(queues)]
+    assert drawn[:20] == ["r", "s"] * 10
+
+
+def test_max_run_allows_repeats_once_one_type_is_left(tmp_path):
+    queues = make_queues(tmp_path, {"Riddle": 5, "SongLyrics": 1})
+    drawn = draw_all(queues)
+    assert len(drawn) == 6
+    assert [id_[0] for id_ in drawn[2:]] == ["r"] * 4
+
+
+def test_zero_weight_types_are_never_drawn(tmp_path):
+    queues = make_queues(tmp_path, {"Riddle": 3, "SongLyrics": 3}, SongLyrics=0)
+    assert [id_[0] for id_ in draw_all(queues)] == ["r"] * 3
+
+
+def test_draw_skips_ids_that_are_no_longer_live(tmp_path):
+    queues = make_queues(tmp_path, {"Riddle": 4, "SongLyrics": 4})
+    dead = {"r00000000000", "r00000000001", "s00000000002"}
+    drawn = draw_all(queues, lambda id_: id_ not in dead)
+    assert sorted(drawn) == sorted(set(ids("r", 4) + ids("s", 4)) - dead)
+    assert queues.draw(lambda _: True) is None
+
+
+def test_draw_state_survives_save_and_load(tmp_path):
+    queues = make_queues(tmp_path, {"Riddle": 6, "SongLyrics": 6}, Riddle=2.0)
+    queues.max_run = None
+    drawn = [queues.draw(lambda _: True) for _ in range(5)]
+    queues.save()
+    (tmp_path / "config.json").write_text('{"weights": {"Riddle": 2}, "max_run": null}')
+    drawn += draw_all(PuzzleQueues.load(str(tmp_path)))
+
+    (tmp_path / "again").mkdir()
+    again = make_queues(tmp_path / "again", {"Riddle": 6, "SongLyrics": 6}, Riddle=2.0)
+    again.max_run = None
+    assert drawn == draw_all(again)
+
+
+RECORDS = [
+    dict(type="Riddle", string_to_encrypt=f"riddle {i}", answer="a", used=False)
+    for i in range(4)
+] + [
+    dict(type="GeneralPhrase", string_to_encrypt=f"phrase {i}", used=i == 0)
+    for i in range(3)
+]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    source = tmp_path / "master-puzzle-list.json"
+    source.write_text(json.dumps(RECORDS))
+    store = PuzzleStore(str(tmp_path / "store"), str(source))
+    monkeypatch.setattr(store_module, "_store", store)
+    snapshot_path = str(tmp_path / "store" / "master.snapshot")
+    monkeypatch.setattr(
+        read, "open_snapshot", lambda s: snapshot.open_snapshot(s, snapshot_path)
+    )
+    return store
+
+
+def unused_ids(store: PuzzleStore) -> set[str]:
+    return {id_ for id_, record in store.items() if not record.get("used")}
+
+
+def test_sync_queues_every_unused_puzzle_by_type(tmp_path, store):
+    queues = PuzzleQueues(str(tmp_path / "queues"))
+    assert queues.sync(store, random.Random(0))
+    assert queues.remaining() == {"GeneralPhrase": 2, "Riddle": 4}
+    queued = set(queues.queues["Riddle"].unpopped()) | set(
+        queues.queues["GeneralPhrase"].unpopped()
+    )
+    assert queued == unused_ids(store)
+
+
+def test_sync_is_a_no_op_until_the_master_list_changes(tmp_path, store, monkeypatch):
+    queues = PuzzleQueues(str(tmp_path / "queues"))
+    queues.sync(store, random.Random(0))
+
+    def fail():
+        raise AssertionError("records read while in sync")
+
+    monkeypatch.setattr("codiac_sandbox.selection.queues.iter_records", fail)
+    assert queues.is_synced(store)
+    assert not queues.sync(store, random.Random(0))
+
+
+def test_sync_drops_popped_used_and_deleted_ids(tmp_path, store):
+    queues = PuzzleQueues(str(tmp_path / "queues"))
+    queues.sync(store, random.Random(0))
+    popped = queues.draw(lambda _: True)
+    assert popped is not None
+    # scheduling marks every drawn puzzle used
+    store.update(popped, dict(used=True))
+
+    riddles = [id_ for id_, r in store.items() if r["type"] == "Riddle"]
+    left = [id_ for id_ in riddles if id_ != popped]
+    store.update(left[0], dict(used=True))
+    store.delete(left[1])
+    added = store.add(dict(type="Riddle", string_to_encrypt="new", answer="b"))
+    store.compact()
+    assert not queues.is_synced(store)
+
+    assert queues.sync(store, random.Random(0))
+    queued = {id_ for queue in queues.queues.values() for id_ in queue.unpopped()}
+    assert queued == unused_ids(store)
+    assert added in queued
+    assert not {popped, left[0], left[1]} & queued
+    assert all(queue.cursor == 0 for queue in queues.queues.values())
+
+
+def test_seeded_sync_is_reproducible(tmp_path, store):
+    orders = []
+    for name in ("a", "b"):
+        queues = PuzzleQueues(str(tmp_path / name))
+        queues.sync(store, random.Random("seed"))
+        orders.append({t: q.unpopped() for t, q in queues.queues.items()})
+    assert orders[0] == orders[1]
@@ -0,0 +1,63 @@
+import json
+import random
+
+import pytest
+
+from codiac_sandbox.crud.read import iter_json_array, reservoir_sample
+
+RECORDS = [
+    {"type": "GeneralPhrase", "string_to_encrypt": 'a [bracketed], "quoted" phrase'},
+    {"type": "DirectQuote", "string_to_encrypt": "x" * 300, "author": "é ü"},
+    [1, 2, {"nested": [3, 4]}],
+    "plain string",
+    17,
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_json_array_matches_json_load(tmp_path, chunk_size, indent):
+    path = tmp_path / "list.json"
+    path.write_text(json.dumps(RECORDS, indent=indent))
+    assert list(iter_json_array(str(path), chunk_size)) == RECORDS
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", "\n[\n]\n"])
+def test_iter_json_array_empty(tmp_path, text):
+    path = tmp_path / "list.json"
+    path.write_text(text)
+    assert list(iter_json_array(str(path), 2)) == []
+
+
+@pytest.mark.parametrize("text", ['{"a": 1}', '[{"a": 1}, {"b": '])
+def test_iter_json_array_rejects_bad_input(tmp_path, text):
+    path = tmp_path / "list.json"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path), 4))
+
+
+def test_reservoir_sample_is_a_distinct_subset():
+    sample = reservoir_sample(range(1000), 10, random.Random(1))
+    assert len(sample) == len(set(sample)) == 10
+    assert set(sample) <= set(range(1000))
+
+
+def test_reservoir_sample_short_stream_returns_everything():
+    assert sorted(reservoir_sample(range(3), 10, random.Random(1))) == [0, 1, 2]
+
+
+def test_reservoir_sample_is_reproducible_with_a_seeded_rng():
+    assert reservoir_sample(range(500), 5, random.Random("x")) == reservoir_sample(
+        range(500), 5, random.Random("x")
+    )
+
+
+def test_reservoir_sample_is_roughly_uniform():
+    rng = random.Random(0)
+    counts = [0] * 10
+    for _ in range(5000):
+        for item in reservoir_sample(range(10), 3, rng):
+            counts[item] += 1
+    # each item is expected 1500 times
+    assert all(1300 < count < 1700 for count in counts)
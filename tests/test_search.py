@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+import codiac_sandbox.crud.duplicates as duplicates
+import codiac_sandbox.crud.search as search
+import codiac_sandbox.crud.store as store_module
+from codiac_sandbox.crud.create import save_puzzle
+from codiac_sandbox.crud.delete import delete_puzzle
+from codiac_sandbox.crud.search import SearchIndex, get_search_index
+from codiac_sandbox.crud.store import PuzzleStore
+from codiac_sandbox.crud.update import compact, update_puzzle
+from codiac_sandbox.puzzle_types import DirectQuote
+
+RECORDS = [
+    dict(type="DirectQuote", string_to_encrypt="Stay hungry", author="Jobs"),
+    dict(type="DirectQuote", string_to_encrypt="The species survives", author="X"),
+    dict(type="SongLyrics", string_to_encrypt="Let it be", artist="The Beatles"),
+]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    source = tmp_path / "master-puzzle-list.json"
+    source.write_text(json.dumps(RECORDS))
+    store = PuzzleStore(str(tmp_path / "store"), str(source))
+    monkeypatch.setattr(store_module, "_store", store)
+    monkeypatch.setattr(search, "_index", None)
+    monkeypatch.setattr(duplicates, "_index", None)
+    # a fresh index that saves next to the tmp store
+    save = SearchIndex.save
+    index_path = str(tmp_path / "store" / "search-index.json")
+    monkeypatch.setattr(SearchIndex, "load", classmethod(lambda cls: cls()))
+    monkeypatch.setattr(SearchIndex, "save", lambda self: save(self, index_path))
+    return store
+
+
+def test_fielded_and_prefix_search(store):
+    first, second, song = store.ids()
+    index = get_search_index()
+    assert index.search("hung") == [first]
+    assert index.search("author:jobs") == [first]
+    assert index.search("artist:jobs") == []
+    assert index.search("*eatle") == [song]
+
+
+def test_unknown_field_prefix_is_searched_as_plain_terms(store):
+    second = store.ids()[1]
+    assert get_search_index().search("survives:species") == [second]
+    assert get_search_index().search("spec:surv") == [second]
+
+
+def test_update_then_add_keeps_the_update(store):
+    first = store.ids()[0]
+    get_search_index()
+    update_puzzle(first, dict(author="Zanzibarquux"))
+    added = save_puzzle(DirectQuote, dict(quote="New one", author="Y"))
+
+    assert get_search_index().search("Zanzibarquux") == [first]
+    assert get_search_index().search("new") == [added]
+    compact()
+    assert get_search_index().search("Zanzibarquux") == [first]
+
+
+def test_search_sees_writes_made_after_loading(store):
+    first, second, _ = store.ids()
+    get_search_index()
+    update_puzzle(first, dict(author="Quuxley"))
+    delete_puzzle(second)
+    index = get_search_index()
+    assert index.search("quuxley") == [first]
+    assert index.search("species") == []
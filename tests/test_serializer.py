@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from codiac_sandbox.hint_types import GiveALetterHint
+from codiac_sandbox.puzzle_types import (
+    CharacterQuote,
+    CryptographBase,
+    DirectQuote,
+    FamousDocumentQuote,
+    GeneralPhrase,
+    ListPuzzle,
+    Riddle,
+    RiddleSolvedInReverse,
+    SongLyrics,
+)
+from codiac_sandbox.utils.puzzle_classes import PUZZLE_CLASSES
+from codiac_sandbox.utils.serializer import serialize_frontend
+
+PUZZLES = [
+    ListPuzzle("Name the planets", ["Mercury", "Venus", "Earth"]),
+    CharacterQuote(
+        "I'll be back.", "Movie", "The Terminator", "The Terminator", "1984"
+    ),
+    FamousDocumentQuote("We the People", "Constitution", "Madison", "1787"),
+    DirectQuote('She said "hi" — naïvely', "Anon"),
+    DirectQuote("Dated", "Someone", "2001"),
+    GeneralPhrase("A stitch in time saves nine"),
+    # no letters at all: empty hints and encryption map
+    GeneralPhrase("1234 !?"),
+    SongLyrics("Let it be", "The Beatles", "Let It Be", "1970", used=True),
+    Riddle("What has keys but can't open locks?", "A piano"),
+    RiddleSolvedInReverse("What runs but never walks?", "A river"),
+]
+IDS = [f"{type(p).__name__}-{i}" for i, p in enumerate(PUZZLES)]
+
+
+def seeded(puzzle: CryptographBase) -> CryptographBase:
+    return puzzle.seed("2025-01-01")
+
+
+def expected(puzzle: CryptographBase) -> dict:
+    puzzle = seeded(puzzle)
+    # the letter map is drawn before the hint order
+    encryption_map = puzzle.encryption_map
+    letters = dict.fromkeys(
+        hint.letter for hint in puzzle.hints if isinstance(hint, GiveALetterHint)
+    )
+    return dict(
+        puzzle_type=puzzle.puzzle_type,
+        string_to_encrypt=puzzle.string_to_encrypt.lower(),
+        hints=[dict(letter=letter, type="GiveALetterHint") for letter in letters],
+        encryption_map=encryption_map,
+        other_info={
+            k.replace("_", " ").title(): str(getattr(puzzle, k))
+            for k in type(puzzle).field_names()
+            if k not in ("puzzle_type", "string_to_encrypt", "used")
+            and getattr(puzzle, k) is not None
+        },
+    )
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES, ids=IDS)
+def test_legacy_matches_to_json(puzzle):
+    legacy = serialize_frontend(seeded(puzzle), legacy=True)
+    assert legacy == json.dumps(seeded(puzzle).to_json(True), indent=2)
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES, ids=IDS)
+def test_json_matches_json_dumps(puzzle):
+    assert serialize_frontend(seeded(puzzle)) == json.dumps(expected(puzzle), indent=2)
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES, ids=IDS)
+def test_compact_matches_json_dumps(puzzle):
+    assert serialize_frontend(seeded(puzzle), compact=True) == json.dumps(
+        expected(puzzle), separators=(",", ":")
+    )
+
+
+def test_output_is_a_function_of_the_seed():
+    first = serialize_frontend(PUZZLES[5].seed("a"))
+    assert serialize_frontend(PUZZLES[5].seed("a")) == first
+    assert serialize_frontend(PUZZLES[5].seed("b")) != first
+
+
+def test_every_class_is_covered():
+    assert {type(p).__name__ for p in PUZZLES} == set(PUZZLE_CLASSES)
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from codiac_sandbox.server import MAX_BODY_BYTES, PuzzleServer
+
+
+async def exchange(request: bytes) -> bytes:
+    listener = await asyncio.start_server(PuzzleServer().handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return response
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1e3", "١٢", str(MAX_BODY_BYTES + 1)])
+def test_bad_content_length_is_refused(length):
+    response = asyncio.run(
+        exchange(
+            f"POST /puzzle/20250101 HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+        )
+    )
+    head = response.split(b"\r\n\r\n")[0].split(b"\r\n")
+    assert head[0] == b"HTTP/1.1 400 Bad Request"
+    assert b"Connection: close" in head
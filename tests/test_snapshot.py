@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from codiac_sandbox.crud.snapshot import map_snapshot, open_snapshot, write_snapshot
+from codiac_sandbox.crud.store import PuzzleStore
+
+ROWS = [
+    ("a" * 12, dict(type="DirectQuote", string_to_encrypt="One", author="Anon")),
+    ("b" * 12, dict(type="DirectQuote", string_to_encrypt="Two", used=True)),
+    ("c" * 12, dict(type="ListPuzzle", string_to_encrypt="Three", items=["x", "y"])),
+]
+
+
+def test_snapshot_round_trips_rows(tmp_path):
+    path = str(tmp_path / "master.snapshot")
+    write_snapshot(path, "digest", ROWS)
+    snapshot = map_snapshot(path)
+    assert snapshot is not None
+    assert snapshot.source_digest == "digest"
+    assert list(snapshot) == ROWS
+    assert snapshot.record(1) == ROWS[1][1]
+    assert snapshot.column("author") == ["Anon", None, None]
+
+
+def test_mapping_is_reused_until_the_file_is_replaced(tmp_path):
+    path = str(tmp_path / "master.snapshot")
+    write_snapshot(path, "first", ROWS)
+    first = map_snapshot(path)
+    assert map_snapshot(path) is first
+
+    write_snapshot(path, "second", ROWS[:1])
+    second = map_snapshot(path)
+    assert second is not first and second is not None
+    assert len(second) == 1
+    # the replaced file's mapping was closed, not leaked
+    with pytest.raises(ValueError):
+        first.value("type", 0)
+
+
+def test_rebuild_unmaps_the_stale_snapshot_first(tmp_path):
+    source = tmp_path / "master-puzzle-list.json"
+    source.write_text(json.dumps([record for _, record in ROWS]))
+    store = PuzzleStore(str(tmp_path / "store"), str(source))
+    path = str(tmp_path / "master.snapshot")
+    write_snapshot(path, "stale", ROWS)
+    stale = map_snapshot(path)
+    assert stale is not None
+
+    snapshot = open_snapshot(store, path)
+    assert snapshot is not None
+    assert snapshot.source_digest == store.source_digest
+    with pytest.raises(ValueError):
+        stale.value("type", 0)
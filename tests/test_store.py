@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from codiac_sandbox.crud.store import PuzzleStore, puzzle_id
+
+RECORDS = [
+    dict(type="DirectQuote", string_to_encrypt="First quote", author="A"),
+    dict(type="DirectQuote", string_to_encrypt="Second quote", author="B"),
+    dict(type="Riddle", string_to_encrypt="A riddle", answer="C", used=True),
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "master-puzzle-list.json"
+    path.write_text(json.dumps(RECORDS, indent=2))
+    return path
+
+
+def open_store(tmp_path, source) -> PuzzleStore:
+    return PuzzleStore(str(tmp_path / "store"), str(source))
+
+
+def test_bootstrap_reads_the_master_list(tmp_path, source):
+    store = open_store(tmp_path, source)
+    assert [data for _, data in store.items()] == RECORDS
+    assert store.ids() == [puzzle_id(data) for data in RECORDS]
+    assert not store.pending()
+
+
+def test_writes_survive_reopening(tmp_path, source):
+    store = open_store(tmp_path, source)
+    first, second, riddle = store.ids()
+    store.update(first, dict(used=True))
+    store.delete(second)
+    added = store.add(dict(type="GeneralPhrase", string_to_encrypt="Added"))
+
+    reopened = open_store(tmp_path, source)
+    assert reopened.ids() == [first, riddle, added]
+    assert reopened.get(first)["used"] is True
+    assert reopened.get(added) == dict(type="GeneralPhrase", string_to_encrypt="Added")
+    assert reopened.pending()
+
+
+def test_duplicates_get_distinct_ids(tmp_path, source):
+    store = open_store(tmp_path, source)
+    ids = store.add_many([RECORDS[0], RECORDS[0]])
+    assert len(set(ids) | set(store.ids())) == 5
+
+
+def test_torn_tail_is_dropped_on_open(tmp_path, source):
+    store = open_store(tmp_path, source)
+    kept = store.add(dict(type="GeneralPhrase", string_to_encrypt="Kept"))
+    with open(store.log_path, "ab") as f:
+        f.write(b'{"id": "cut", "data": {"type": "Gen')
+
+    reopened = open_store(tmp_path, source)
+    assert "cut" not in reopened
+    assert reopened.get(kept)["string_to_encrypt"] == "Kept"
+    # the next append starts on a line of its own
+    added = reopened.add(dict(type="GeneralPhrase", string_to_encrypt="After"))
+    assert open_store(tmp_path, source).get(added)["string_to_encrypt"] == "After"
+
+
+def test_compact_writes_ids_into_the_master_list(tmp_path, source):
+    store = open_store(tmp_path, source)
+    store.update(store.ids()[0], dict(used=True))
+    store.compact()
+    saved = json.loads(source.read_text())
+    assert [record.pop("id") for record in saved] == store.ids()
+    assert saved == [data for _, data in store.items()]
+    assert not store.pending()
+
+
+def test_ids_survive_edits_and_rebuilds(tmp_path, source):
+    store = open_store(tmp_path, source)
+    ids = store.ids()
+    store.update(ids[0], dict(author="Z"))
+    store.compact()
+
+    # a hand edit of the text, then a fresh clone without resources/store
+    saved = json.loads(source.read_text())
+    saved[0]["string_to_encrypt"] = "First quote, fixed"
+    source.write_text(json.dumps(saved, indent=2))
+    rebuilt = PuzzleStore(str(tmp_path / "fresh"), str(source))
+    assert rebuilt.ids() == ids
+    assert rebuilt.get(ids[0])["string_to_encrypt"] == "First quote, fixed"
+    assert "id" not in rebuilt.get(ids[0])
+
+
+def test_repeated_ids_in_the_master_list_are_replaced(tmp_path, source):
+    saved = [dict(id="aaaaaaaaaaaa", **record) for record in RECORDS[:2]]
+    source.write_text(json.dumps(saved))
+    store = open_store(tmp_path, source)
+    assert store.ids()[0] == "aaaaaaaaaaaa"
+    assert store.ids()[1] == puzzle_id(RECORDS[1])
+
+
+def test_crash_between_master_list_and_log_is_recovered(tmp_path, source, monkeypatch):
+    store = open_store(tmp_path, source)
+    first = store.ids()[0]
+    store.update(first, dict(used=True))
+
+    def crash(*_):
+        raise OSError("crashed before the log was rewritten")
+
+    monkeypatch.setattr(PuzzleStore, "_rewrite_log", crash)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.undo()
+
+    reopened = open_store(tmp_path, source)
+    assert not reopened.pending()
+    assert reopened.get(first)["used"] is True
+    assert [record["id"] for record in json.loads(source.read_text())] == (
+        reopened.ids()
+    )
+
+
+def test_crash_from_an_older_checkpoint_is_recovered(tmp_path, source):
+    # a compaction that left no digest behind is matched against the records
+    store = open_store(tmp_path, source)
+    first = store.ids()[0]
+    store.update(first, dict(used=True))
+    source.write_text(
+        json.dumps([dict(id=id_, **data) for id_, data in store.items()], indent=2)
+    )
+
+    reopened = open_store(tmp_path, source)
+    assert not reopened.pending()
+    assert reopened.get(first)["used"] is True
+
+
+def test_pulled_master_list_keeps_pending_writes(tmp_path, source):
+    store = open_store(tmp_path, source)
+    store.compact()
+    first, second, _ = store.ids()
+    store.update(first, dict(used=True))
+
+    # someone else's edit arrives while ours is still only in the log
+    saved = json.loads(source.read_text())
+    saved[1]["author"] = "Pulled"
+    source.write_text(json.dumps(saved, indent=2))
+
+    reopened = open_store(tmp_path, source)
+    assert reopened.pending()
+    assert reopened.get(first)["used"] is True
+    assert reopened.get(second)["author"] == "Pulled"
+    reopened.compact()
+    assert open_store(tmp_path, source).get(first)["used"] is True
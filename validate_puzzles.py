@@ -0,0 +1,52 @@
+from argparse import ArgumentParser
+from collections import Counter
+import sys
+
+from codiac_sandbox.crud.read import iter_records
+from codiac_sandbox.utils.solver import MAX_SOLUTIONS, validate_records
+
+parser = ArgumentParser(
+    description="Check that every stored puzzle has one reading, and count the hints it needs"
+)
+parser.add_argument(
+    "--wordlist",
+    action="append",
+    default=[],
+    help="extra words, one per line; puzzle words missing from them are reported, "
+    "so that check only runs with a wordlist",
+)
+parser.add_argument("--workers", type=int, default=None, help="process pool size")
+parser.add_argument(
+    "--max-hints",
+    type=int,
+    default=None,
+    help="exit with status 1 if any puzzle needs more revealed letters than this",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    records = dict(iter_records())
+    reports = validate_records(records.items(), args.wordlist, args.workers)
+
+    for puzzle_id, report in sorted(reports.items(), key=lambda r: -r[1].min_hints):
+        if report.unique and not report.unknown_words:
+            continue
+        readings = (
+            f"{report.solutions}+"
+            if report.solutions >= MAX_SOLUTIONS
+            else report.solutions
+        )
+        print(
+            f"{puzzle_id}: {report.min_hints} hints, {readings} readings: "
+            f"{str(records[puzzle_id]['string_to_encrypt'])[:60]}"
+        )
+        if report.unknown_words:
+            print(f"    not in the wordlist: {', '.join(report.unknown_words)}")
+
+    print()
+    for hints, count in sorted(Counter(r.min_hints for r in reports.values()).items()):
+        print(f"{count:>7,} puzzles need {hints} hints")
+    if args.max_hints is not None and any(
+        report.min_hints > args.max_hints for report in reports.values()
+    ):
+        sys.exit(1)